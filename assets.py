@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import sys
+import tempfile
+from typing import NamedTuple
+
+try:
+    from PIL import Image
+except ImportError: # Optional: without Pillow the original files are served as-is
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Environment knobs:
+#   TIPS_IMAGE_FORMAT    webp (default), png or jpeg
+#   TIPS_IMAGE_QUALITY   1-100 for webp/jpeg (default 100); 100 with webp is lossless
+#   TIPS_IMAGE_MAX_DIM   longest side in pixels, larger images are downscaled (default 0 = keep)
+# The defaults only recompress losslessly; lower the quality or set a max size to trade fidelity for bytes.
+#   TIPS_CACHE_DIR       where encoded variants are kept (default .cache/tips)
+
+EXTENSIONS = {"webp": ".webp", "png": ".png", "jpeg": ".jpg"}
+# Animated or otherwise special formats are passed through untouched
+PASSTHROUGH = (".gif",)
+
+class AssetSettings(NamedTuple):
+    format: str = "webp"
+    quality: int = 100
+    max_dim: int = 0
+
+    def key(self):
+        return f"{self.format}-q{self.quality}-d{self.max_dim}"
+
+def settings_from_env():
+    fmt = os.getenv("TIPS_IMAGE_FORMAT", "webp").lower()
+    if fmt == "jpg":
+        fmt = "jpeg"
+    if fmt not in EXTENSIONS:
+        logger.warning("Unknown TIPS_IMAGE_FORMAT %r, using webp", fmt)
+        fmt = "webp"
+    return AssetSettings(fmt, int(os.getenv("TIPS_IMAGE_QUALITY", "100")), int(os.getenv("TIPS_IMAGE_MAX_DIM", "0")))
+
+def cache_dir():
+    return os.getenv("TIPS_CACHE_DIR", os.path.join(".cache", "tips"))
+
+# (path, size, mtime) -> source sha256, so unchanged files aren't re-hashed on every /tips
+_source_hashes = {}
+# (source sha256, settings key) whose re-encode came out larger, so they aren't encoded again this run
+_no_gain = set()
+
+def _source_hash(path):
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    digest = _source_hashes.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                sha.update(block)
+        digest = _source_hashes[key] = sha.hexdigest()
+    return digest
+
+def _encode(path, settings):
+    with Image.open(path) as img:
+        img.load()
+        if settings.max_dim and max(img.size) > settings.max_dim:
+            img.thumbnail((settings.max_dim, settings.max_dim), Image.LANCZOS)
+
+        out = io.BytesIO()
+        if settings.format == "jpeg":
+            if img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            img.save(out, "JPEG", quality=settings.quality, optimize=True, progressive=True)
+        elif settings.format == "webp":
+            lossless = settings.quality >= 100
+            img.save(out, "WEBP", quality=100 if lossless else settings.quality, lossless=lossless, method=6)
+        else:
+            img.save(out, "PNG", optimize=True)
+        return out.getvalue()
+
+def optimize(path, settings=None):
+    """
+    Returns (path, filename) of the variant to upload for a source image, encoding it on first use.
+    Variants are stored under their source hash + settings, so a changed image or setting gets a new entry
+    and everything else is a cache hit. Returns the original itself when it's smaller or Pillow is missing.
+    """
+    settings = settings or settings_from_env()
+    stem, ext = os.path.splitext(os.path.basename(path))
+    if Image is None or ext.lower() in PASSTHROUGH:
+        return path, os.path.basename(path)
+
+    digest = _source_hash(path)
+    if (digest, settings.key()) in _no_gain:
+        return path, os.path.basename(path)
+    directory = cache_dir()
+    out_ext = EXTENSIONS[settings.format]
+    target = os.path.join(directory, f"{digest}-{settings.key()}{out_ext}")
+    if os.path.exists(target):
+        return target, stem + out_ext
+
+    data = _encode(path, settings)
+    if len(data) >= os.path.getsize(path):
+        # Re-encoding didn't help: serve the original and don't keep a copy of it
+        _no_gain.add((digest, settings.key()))
+        return path, os.path.basename(path)
+
+    os.makedirs(directory, exist_ok=True)
+    # Write then rename, so a crash never leaves a truncated cache entry
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, target)
+    logger.info("🖼️ Optimized %s: %d KiB -> %d KiB", path, os.path.getsize(path) // 1024, len(data) // 1024)
+    return target, stem + out_ext
+
+_warned_missing = False
+
+async def prepare(paths, settings=None):
+    """Optimizes the given images off the event loop. Returns [(path, filename)] in the same order."""
+    global _warned_missing
+    if Image is None and not _warned_missing:
+        _warned_missing = True
+        logger.warning("Pillow not installed, tip images are uploaded unoptimized (pip install Pillow)")
+    settings = settings or settings_from_env()
+    return await asyncio.to_thread(lambda: [optimize(path, settings) for path in paths])
+
+if __name__ == "__main__":
+    # Pre-encodes every image in the given directories so the first /tips is already a cache hit.
+    # Usage: python assets.py img/viking img/cesare
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if Image is None:
+        sys.exit("Pillow is required: pip install Pillow")
+    settings = settings_from_env()
+    before = after = 0
+    for directory in sys.argv[1:] or ["img/viking", "img/cesare"]:
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            source = os.path.join(directory, name)
+            if not name.lower().endswith((".png", ".jpg", ".jpeg", ".gif")):
+                continue
+            variant, _ = optimize(source, settings)
+            before += os.path.getsize(source)
+            after += os.path.getsize(variant)
+    print(f"{settings.key()}: {before / 1024:.0f} KiB -> {after / 1024:.0f} KiB")
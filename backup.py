@@ -0,0 +1,101 @@
+import asyncio
+import datetime
+import gzip
+import logging
+import os
+import shutil
+import sqlite3
+import time
+import database
+
+logger = logging.getLogger(__name__)
+
+# Environment knobs:
+#   BACKUP_DIR              where snapshots go (default backups)
+#   BACKUP_KEEP             how many compressed snapshots to keep (default 7)
+#   BACKUP_INTERVAL_HOURS   background snapshot period, 0 disables it (default 24)
+#   BACKUP_PAGES            pages copied per backup step (default 256, i.e. 1 MiB at 4 KiB pages)
+#   BACKUP_STEP_SLEEP_MS    pause between steps so writers get the database (default 10)
+
+SNAPSHOT_PREFIX = "scheduler-"
+SNAPSHOT_SUFFIX = ".db.gz"
+
+# One snapshot at a time, whether from the background loop or /backup
+_backup_lock = asyncio.Lock()
+
+def backup_running():
+    return _backup_lock.locked()
+
+def backup_dir():
+    return os.getenv("BACKUP_DIR", "backups")
+
+def interval_hours():
+    return float(os.getenv("BACKUP_INTERVAL_HOURS", "24"))
+
+def list_snapshots():
+    """Snapshot paths, newest first (the timestamped names sort chronologically)."""
+    directory = backup_dir()
+    if not os.path.isdir(directory):
+        return []
+    names = [n for n in os.listdir(directory) if n.startswith(SNAPSHOT_PREFIX) and n.endswith(SNAPSHOT_SUFFIX)]
+    return [os.path.join(directory, n) for n in sorted(names, reverse=True)]
+
+def _check_and_compress(raw_path, gz_path):
+    """Runs in a worker thread: verify the copy, gzip it, drop the uncompressed file."""
+    with sqlite3.connect(raw_path) as db:
+        (result,) = db.execute("PRAGMA quick_check").fetchone()
+    if result != "ok":
+        raise RuntimeError(f"snapshot failed quick_check: {result}")
+
+    tmp = gz_path + ".tmp"
+    with open(raw_path, "rb") as src, gzip.open(tmp, "wb", compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+    os.replace(tmp, gz_path)
+    os.remove(raw_path)
+
+def _rotate(keep):
+    removed = 0
+    for path in list_snapshots()[keep:]:
+        os.remove(path)
+        removed += 1
+    return removed
+
+async def create_snapshot():
+    """
+    Takes a compressed, integrity-checked snapshot of the live database and rotates old ones.
+    Returns {"path", "bytes", "seconds", "rotated"}. Raises if the backend has nothing on disk to back up.
+    """
+    if database.backend() != "sqlite":
+        raise RuntimeError(f"the {database.backend()} backend has no database file to back up")
+
+    async with _backup_lock:
+        started = time.perf_counter()
+        directory = backup_dir()
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+        raw_path = os.path.join(directory, f"{SNAPSHOT_PREFIX}{stamp}.db")
+        gz_path = raw_path + ".gz"
+
+        try:
+            await database.backup(
+                raw_path,
+                pages=int(os.getenv("BACKUP_PAGES", "256")),
+                sleep=int(os.getenv("BACKUP_STEP_SLEEP_MS", "10")) / 1000,
+            )
+            await asyncio.to_thread(_check_and_compress, raw_path, gz_path)
+        except BaseException:
+            for leftover in (raw_path, gz_path + ".tmp"):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+            raise
+
+        rotated = await asyncio.to_thread(_rotate, max(1, int(os.getenv("BACKUP_KEEP", "7"))))
+        result = {
+            "path": gz_path,
+            "bytes": os.path.getsize(gz_path),
+            "seconds": time.perf_counter() - started,
+            "rotated": rotated,
+        }
+        logger.info("💾 Backup written to %s (%d KiB in %.1fs, %d old snapshot(s) removed)",
+                    gz_path, result["bytes"] // 1024, result["seconds"], rotated)
+        return result
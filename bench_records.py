@@ -0,0 +1,74 @@
+import asyncio
+import datetime
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import aiosqlite
+import database
+
+# Compares the scheduler working set held as aiosqlite.Row (SELECT e.*) against ReminderRecord projections.
+# Usage: python bench_records.py [event_count]
+
+DESCRIPTION = "Rally at the north gate, bring healers and full march. / 北門集合, 帶治療兵, 滿編出征. " * 3
+ICON = "https://img.icons8.com/color/96/bear.png"
+
+def populate(path, count):
+    start = datetime.datetime(2030, 1, 1)
+    with sqlite3.connect(path) as db:
+        db.executemany("""
+            INSERT INTO events (guild_id, name, event_time, description, event_type, repeat_config, icon_url, color_hex, duration)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            (i % 50, "Bear / 熊", str(start + datetime.timedelta(minutes=i)), DESCRIPTION, "Bear / 熊", "1d", ICON, 0xe67e22, 30)
+            for i in range(count)
+        ))
+        db.execute("""
+            INSERT INTO reminders (event_id, offset_minutes, fire_at)
+            SELECT id, 5, datetime(event_time, '-5 minutes') FROM events
+        """)
+
+async def measure(label, fetch):
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    rows = await fetch()
+    elapsed = time.perf_counter() - started
+    held = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    print(f"{label:<16} rows={len(rows):>7}  held={held / 1024 / 1024:8.1f} MiB  per_row={held / max(len(rows), 1):6.0f} B  fetch={elapsed:6.2f}s")
+    del rows
+
+async def main(count):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    database.DB_NAME = path
+    try:
+        await database.init_db()
+        populate(path, count)
+        far_future = datetime.datetime(2100, 1, 1)
+
+        async def rows():
+            async with aiosqlite.connect(path) as db:
+                db.row_factory = aiosqlite.Row
+                async with db.execute("""
+                    SELECT e.*, r.id AS reminder_id, r.offset_minutes, r.fire_at
+                    FROM reminders r JOIN events e ON e.id = r.event_id
+                    WHERE r.sent = 0 AND r.fire_at <= ?
+                """, (far_future,)) as cursor:
+                    return await cursor.fetchall()
+
+        async def records():
+            return await database.get_missed_reminders(far_future)
+
+        print(f"Pending events: {count}")
+        await measure("aiosqlite.Row", rows)
+        await measure("ReminderRecord", records)
+    finally:
+        os.remove(path)
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
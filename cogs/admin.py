@@ -0,0 +1,109 @@
+import discord
+from discord import app_commands
+from discord.ext import commands, tasks
+import io
+import logging
+import os
+import time
+from typing import Literal
+import backup
+import database
+import diagnostics
+
+logger = logging.getLogger(__name__)
+
+class Admin(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        hours = backup.interval_hours()
+        if hours > 0 and database.backend() == "sqlite":
+            self.backup_loop.change_interval(hours=hours)
+            self.backup_loop.start()
+
+    def cog_unload(self):
+        self.backup_loop.cancel()
+
+    @tasks.loop(hours=24)
+    async def backup_loop(self):
+        # After a restart, don't snapshot again if the newest one is recent enough
+        snapshots = backup.list_snapshots()
+        if snapshots and time.time() - os.path.getmtime(snapshots[0]) < backup.interval_hours() * 3600 * 0.9:
+            return
+        try:
+            await backup.create_snapshot()
+        except Exception as e:
+            logger.exception("❌ Scheduled backup failed: %s", e)
+
+    @backup_loop.before_loop
+    async def before_backup_loop(self):
+        await self.bot.wait_until_ready()
+
+    @app_commands.command(name="backup", description="Snapshot the schedule database now (Admin)")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def backup_command(self, interaction: discord.Interaction):
+        if backup.backup_running():
+            await interaction.response.send_message("⚠️ A backup is already running.", ephemeral=True)
+            return
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        logger.info("Backup requested by %s", interaction.user)
+        try:
+            result = await backup.create_snapshot()
+        except Exception as e:
+            logger.exception("❌ Backup failed: %s", e)
+            await interaction.followup.send(f"❌ Backup failed: {e}", ephemeral=True)
+            return
+
+        kept = len(backup.list_snapshots())
+        await interaction.followup.send(
+            f"💾 Backup saved: `{os.path.basename(result['path'])}` ({result['bytes'] / 1024:.0f} KiB, {result['seconds']:.1f}s)"
+            f"\n{kept} snapshot(s) kept, {result['rotated']} rotated out.",
+            ephemeral=True
+        )
+
+    @app_commands.command(name="profile", description="Profile the running bot and return the hottest functions (Admin)")
+    @app_commands.describe(seconds="How long to profile (1-60, default 10)", mode="cprofile (exact, slower) or sampling (cheap)")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def profile(self, interaction: discord.Interaction, seconds: int = 10, mode: Literal["cprofile", "sampling"] = "sampling"):
+        seconds = max(1, min(seconds, 60))
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        if diagnostics.profile_running():
+            await interaction.followup.send("⚠️ A profile is already running.", ephemeral=True)
+            return
+
+        logger.info("Profiling for %ds (%s) requested by %s", seconds, mode, interaction.user)
+        if mode == "cprofile":
+            report = await diagnostics.profile_cprofile(seconds)
+        else:
+            report = await diagnostics.profile_sampling(seconds)
+
+        msg = f"📈 **{mode}** profile over {seconds}s"
+        monitor = getattr(self.bot, "loop_monitor", None)
+        if monitor:
+            lag = monitor.stats()
+            msg += f"\nLoop lag: last `{lag['last_lag_ms']}ms` | avg `{lag['avg_lag_ms']}ms` | max `{lag['max_lag_ms']}ms` | stalls `{lag['stalls']}`"
+
+        file = discord.File(io.BytesIO(report.encode("utf-8")), filename=f"profile-{mode}.txt")
+        await interaction.followup.send(msg, file=file, ephemeral=True)
+
+    @app_commands.command(name="scheduler_stats", description="Show reminder scheduler tick metrics (Admin)")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def scheduler_stats(self, interaction: discord.Interaction):
+        scheduler = self.bot.get_cog("Scheduler")
+        if not scheduler:
+            await interaction.response.send_message("⚠️ Scheduler is not loaded.", ephemeral=True)
+            return
+
+        m = scheduler.metrics
+        msg = (
+            f"⏱️ **Scheduler**\n"
+            f"Ticks `{m['ticks']}` | last `{m['last_tick_ms']}ms` | avg `{m['avg_tick_ms']}ms` | max `{m['max_tick_ms']}ms`\n"
+            f"Next tick in `{m['interval_s']}s` from last start (`{m['interval_reason']}`) | next due `{m['next_due_at'] or 'nothing'}`\n"
+            f"Overruns `{m['overruns']}` | overlaps skipped `{m['overlaps_skipped']}` | "
+            f"sliced drains `{m['sliced_drains']}` | early wakeups `{m['early_wakeups']}`"
+        )
+        await interaction.response.send_message(msg, ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(Admin(bot))
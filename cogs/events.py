@@ -1,12 +1,29 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
+import asyncio
 import datetime
+import io
+import logging
+import os
+import tempfile
+import time
 import database
 import re
-from typing import Optional
+from typing import Literal, Optional
 from constants import EventConfig
 
+logger = logging.getLogger(__name__)
+
+# Strong references to in-flight background saves (asyncio only keeps weak ones)
+_background_tasks = set()
+
+# How long a rendered /list stays valid if nothing in the guild is written
+LIST_CACHE_TTL = 30 # seconds
+
+# Discord shows at most 25 autocomplete choices, each name up to 100 characters
+AUTOCOMPLETE_LIMIT = 25
+
 class EventDetailsModal(discord.ui.Modal, title="Event Details / 活動詳情"):
     event_time = discord.ui.TextInput(
         label="Time (UTC) [Format: YYYY-MM-DD HH:MM]",
@@ -31,7 +48,7 @@ class EventDetailsModal(discord.ui.Modal, title="Event Details / 活動詳情"):
         max_length=1000
     )
 
-    def __init__(self, name, event_type, repeat_interval, icon_url, color_hex, mode="create", event_id=None, default_time=None, default_desc=None, default_duration=0):
+    def __init__(self, name, event_type, repeat_interval, icon_url, color_hex, mode="create", event_id=None, default_time=None, default_desc=None, default_duration=0, series_id=None):
         super().__init__()
         self.name = name
         self.event_type = event_type
@@ -40,6 +57,7 @@ class EventDetailsModal(discord.ui.Modal, title="Event Details / 活動詳情"):
         self.color_hex = color_hex
         self.mode = mode
         self.event_id = event_id
+        self.series_id = series_id
         
         if default_time:
             self.event_time.default = default_time
@@ -48,6 +66,7 @@ class EventDetailsModal(discord.ui.Modal, title="Event Details / 活動詳情"):
         self.duration.default = str(default_duration)
 
     async def on_submit(self, interaction: discord.Interaction):
+        received = time.perf_counter()
         try:
             # Validate Time
             try:
@@ -69,16 +88,28 @@ class EventDetailsModal(discord.ui.Modal, title="Event Details / 活動詳情"):
                 await interaction.response.send_message("❌ Invalid duration. Please enter a number.", ephemeral=True)
                 return
 
+            # Acknowledge before touching the DB so we never miss the 3s interaction deadline
+            await interaction.response.defer()
+        except Exception as e:
+            await interaction.response.send_message(f"❌ Error saving event: {str(e)}", ephemeral=True)
+            logger.exception("ERROR in on_submit: %s", e)
+            return
+
+        timings = {"ack": time.perf_counter() - received}
+        task = asyncio.create_task(self.save_and_report(interaction, start_time, duration_mins, timings))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    async def save_and_report(self, interaction: discord.Interaction, start_time, duration_mins, timings):
+        """Background half of on_submit: persist, check conflicts, then report through the followup webhook."""
+        try:
+            phase_start = time.perf_counter()
+
             # Save to DB
             if self.mode == "create":
-                await database.add_event(
-                    interaction.guild.id, self.name, start_time, self.description.value,
-                    self.event_type, None, self.repeat_interval, self.icon_url, self.color_hex, duration_mins
-                )
-                # Create Loop Instances
+                # Repeating events are saved as a series: the first occurrence plus 5 more
+                delta = None
                 if self.repeat_interval:
-                    current_time = start_time
-                    delta = None
                     match = re.match(r"(\d+)([dhm])", self.repeat_interval)
                     if match:
                         amount = int(match.group(1))
@@ -86,69 +117,124 @@ class EventDetailsModal(discord.ui.Modal, title="Event Details / 活動詳情"):
                         if unit == 'd': delta = datetime.timedelta(days=amount)
                         elif unit == 'h': delta = datetime.timedelta(hours=amount)
                         elif unit == 'm': delta = datetime.timedelta(minutes=amount)
-                    
-                    if delta:
-                         for _ in range(5):
-                            current_time += delta
-                            await database.add_event(
-                                interaction.guild.id, self.name, current_time, self.description.value,
-                                self.event_type, None, self.repeat_interval, self.icon_url, self.color_hex, duration_mins
-                            )
+
+                if delta:
+                    series_id = await database.add_series(
+                        interaction.guild.id, self.name, [start_time + delta * i for i in range(6)], self.description.value,
+                        self.event_type, None, self.repeat_interval, self.icon_url, self.color_hex, duration_mins
+                    )
+                else:
+                    series_id = None
+                    event_id = await database.add_event(
+                        interaction.guild.id, self.name, start_time, self.description.value,
+                        self.event_type, None, self.repeat_interval, self.icon_url, self.color_hex, duration_mins
+                    )
 
             elif self.mode == "edit":
                 if self.event_id:
-                    await database.delete_event(self.event_id)
-                await database.add_event(
+                    await database.delete_event(self.event_id, interaction.guild.id)
+                # The edited occurrence stays in its series
+                series_id = None
+                event_id = await database.add_event(
                      interaction.guild.id, self.name, start_time, self.description.value,
-                    self.event_type, None, self.repeat_interval, self.icon_url, self.color_hex, duration_mins
+                    self.event_type, None, self.repeat_interval, self.icon_url, self.color_hex, duration_mins,
+                    series_id=self.series_id
                 )
 
+            timings["persist"] = time.perf_counter() - phase_start
+            phase_start = time.perf_counter()
+
             # Confirm & Check Conflicts
             msg = f"✅ Event **{self.name}** saved!\nStart: <t:{int(start_time.replace(tzinfo=datetime.timezone.utc).timestamp())}:F>"
             
-            # Conflict Detection Logic
-            new_start = start_time
-            new_end = start_time + datetime.timedelta(minutes=duration_mins)
-            
-            events = await database.get_all_events(interaction.guild.id)
-            conflicts = []
-            
-            for e in events:
-                try:
-                    e_start = datetime.datetime.strptime(e['event_time'], "%Y-%m-%d %H:%M:%S")
-                except ValueError:
-                    e_start = datetime.datetime.strptime(e['event_time'], "%Y-%m-%d %H:%M:%S.%f")
-                
-                # Duration default 0 if column null (handled by migration but be safe)
-                e_dur = e['duration'] if 'duration' in e.keys() else 0
-                e_end = e_start + datetime.timedelta(minutes=e_dur)
-
-                if e['name'] == self.name and abs((e_start - start_time).total_seconds()) < 1:
-                    continue 
-                
-                if (new_start < e_end) and (new_end > e_start):
-                    conflicts.append(e)
+            # Conflicts are maintained on write; just read what this save produced
+            if series_id:
+                conflicts = await database.get_event_conflicts(interaction.guild.id, series_id=series_id)
+            else:
+                conflicts = await database.get_event_conflicts(interaction.guild.id, [event_id])
+            conflicts = [other for others in conflicts.values() for other in others]
 
             if conflicts:
                 msg += "\n\n⚠️ **CONFLICT DETECTED / 與其他事件有衝突**\n"
-                for c in conflicts[:3]:
-                    c_time = c['event_time']
-                    msg += f"- **{c['name']}** at `{c_time}`\n"
+                for _, c_name, c_time in conflicts[:3]:
+                    msg += f"- **{c_name}** at `{c_time}`\n"
+
+            timings["conflicts"] = time.perf_counter() - phase_start
+            phase_start = time.perf_counter()
 
-            await interaction.response.edit_message(content=msg, view=None)
+            await interaction.edit_original_response(content=msg, view=None)
+            timings["report"] = time.perf_counter() - phase_start
 
         except Exception as e:
-            await interaction.response.send_message(f"❌ Error saving event: {str(e)}", ephemeral=True)
-            print(f"ERROR in on_submit: {e}")
-            import traceback
-            traceback.print_exc()
+            await interaction.followup.send(f"❌ Error saving event: {str(e)}", ephemeral=True)
+            logger.exception("ERROR in on_submit: %s", e)
+
+        finally:
+            phases = " ".join(f"{name}={secs * 1000:.1f}ms" for name, secs in timings.items())
+            logger.info("⏱️ [on_submit] %s '%s': %s", self.mode, self.name, phases)
+
+
+class SeriesModal(discord.ui.Modal):
+    """Asks for the number of minutes for a series-wide shift or duration change."""
+    def __init__(self, series_id, operation):
+        self.series_id = series_id
+        self.operation = operation
+        if operation == "shift":
+            super().__init__(title="Shift Series / 移動系列")
+            label, placeholder = "Shift by minutes (+/-) / 移動分鐘數", "-30"
+        else:
+            super().__init__(title="Series Duration / 系列持續時間")
+            label, placeholder = "Duration (mins) / 持續時間 (分鐘)", "60"
+        self.minutes = discord.ui.TextInput(label=label, placeholder=placeholder, min_length=1, max_length=6)
+        self.add_item(self.minutes)
+
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            minutes = int(self.minutes.value.strip())
+        except ValueError:
+            await interaction.response.send_message("❌ Please enter a whole number of minutes.", ephemeral=True)
+            return
+
+        if self.operation == "shift":
+            count = await database.shift_series(interaction.guild.id, self.series_id, minutes)
+            msg = f"⏩ Shifted {count} event(s) in the series by {minutes:+d} min."
+        else:
+            if minutes < 0:
+                await interaction.response.send_message("❌ Duration can't be negative.", ephemeral=True)
+                return
+            if minutes > database.MAX_EVENT_DURATION:
+                await interaction.response.send_message(f"❌ Duration can't exceed {database.MAX_EVENT_DURATION} min.", ephemeral=True)
+                return
+            count = await database.set_series_duration(interaction.guild.id, self.series_id, minutes)
+            msg = f"⏳ Set duration to {minutes} min for {count} event(s) in the series."
+
+        await interaction.response.edit_message(content=msg, view=None)
+
+
+class SeriesDeleteConfirmView(discord.ui.View):
+    """Ephemeral yes/no step before a whole series is deleted."""
+    def __init__(self, series_id):
+        super().__init__(timeout=60)
+        self.series_id = series_id
+
+    @discord.ui.button(label="Delete / 刪除", style=discord.ButtonStyle.danger, emoji="🗑️")
+    async def confirm_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        count = await database.delete_series(interaction.guild.id, self.series_id)
+        self.stop()
+        await interaction.response.edit_message(content=f"🗑️ Deleted {count} event(s) in the series.", view=None)
+
+    @discord.ui.button(label="Cancel / 取消", style=discord.ButtonStyle.secondary)
+    async def cancel_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.stop()
+        await interaction.response.edit_message(content="Cancelled, nothing was deleted. / 已取消", view=None)
 
 
 class EventCreationView(discord.ui.View):
-    def __init__(self, mode="create", event_id=None, default_values=None):
+    def __init__(self, mode="create", event_id=None, default_values=None, series_id=None):
         super().__init__(timeout=180)
         self.mode = mode
         self.event_id = event_id
+        self.series_id = series_id
         self.selected_name = None
         self.selected_repeat = None
         
@@ -210,6 +296,12 @@ class EventCreationView(discord.ui.View):
         # Find the type select
         self.select_type_item.options = friendly_labels
 
+        # Series buttons only make sense when editing an occurrence of a repeating event
+        if mode != "edit" or not series_id:
+            self.remove_item(self.delete_series_button)
+            self.remove_item(self.shift_series_button)
+            self.remove_item(self.series_duration_button)
+
         # Handle Defaults
         if default_values:
             self.default_time = default_values.get('time')
@@ -282,14 +374,37 @@ class EventCreationView(discord.ui.View):
             event_id=self.event_id,
             default_time=self.default_time,
             default_desc=self.default_desc,
-            default_duration=default_dur
+            default_duration=default_dur,
+            series_id=self.series_id
         )
         await interaction.response.send_modal(modal)
 
+    @discord.ui.button(label="Delete Series / 刪除系列", style=discord.ButtonStyle.danger, emoji="🗑️", row=3)
+    async def delete_series_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.send_message(
+            "⚠️ Delete **every** event in this series? / 確定刪除整個系列?",
+            view=SeriesDeleteConfirmView(self.series_id),
+            ephemeral=True
+        )
+
+    @discord.ui.button(label="Shift Series / 移動系列", style=discord.ButtonStyle.secondary, emoji="⏩", row=3)
+    async def shift_series_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.send_modal(SeriesModal(self.series_id, "shift"))
+
+    @discord.ui.button(label="Series Duration / 系列時長", style=discord.ButtonStyle.secondary, emoji="⏳", row=3)
+    async def series_duration_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.send_modal(SeriesModal(self.series_id, "duration"))
+
 
 class Events(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # /list response cache and in-flight renders, keyed by (guild_id, limit)
+        self._list_cache = {}
+        self._list_inflight = {}
+        # event_id autocomplete index per guild: guild_id -> (version, [(id, label, search_text)])
+        self._event_index = {}
+        self._event_index_locks = {}
         # Register context menu
         self.ctx_menu = app_commands.ContextMenu(
             name="Edit Event",
@@ -324,12 +439,60 @@ class Events(commands.Cog):
         await self.launch_edit(interaction, event_id)
 
     @app_commands.command(name="update", description="Update an event by ID")
+    @app_commands.describe(event_id="Start typing a name, time or ID")
     async def update_event_command(self, interaction: discord.Interaction, event_id: int):
         await self.launch_edit(interaction, event_id)
 
+    @update_event_command.autocomplete("event_id")
+    async def update_event_id_autocomplete(self, interaction: discord.Interaction, current: str):
+        return await self.event_id_choices(interaction, current)
+
+    async def get_event_index(self, guild_id: int):
+        """
+        Returns the guild's autocomplete entries, rebuilt from one indexed query only after
+        an event write bumps the guild version. Keystrokes in between are served from memory.
+        """
+        version = database.get_guild_version(guild_id)
+        cached = self._event_index.get(guild_id)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        lock = self._event_index_locks.setdefault(guild_id, asyncio.Lock())
+        async with lock:
+            cached = self._event_index.get(guild_id)
+            if cached and cached[0] == database.get_guild_version(guild_id):
+                return cached[1]
+
+            version = database.get_guild_version(guild_id)
+            mapping = EventConfig.get_legacy_mapping()
+            entries = []
+            for event_id, name, event_time in await database.get_event_index(guild_id):
+                name = mapping.get(name, name)
+                label = f"#{event_id} · {name} · {event_time[:16]} UTC"
+                entries.append((event_id, label[:100], f"{event_id} {name} {event_time[:16]}".lower()))
+
+            # Only keep it if no write landed while we were loading
+            if database.get_guild_version(guild_id) == version:
+                self._event_index[guild_id] = (version, entries)
+            return entries
+
+    async def event_id_choices(self, interaction: discord.Interaction, current: str):
+        if not interaction.guild:
+            return []
+        entries = await self.get_event_index(interaction.guild.id)
+        query = current.strip().lower()
+
+        choices = []
+        for event_id, label, search_text in entries:
+            # An ID prefix or any fragment of the name/time matches
+            if not query or str(event_id).startswith(query) or query in search_text:
+                choices.append(app_commands.Choice(name=label, value=event_id))
+                if len(choices) >= AUTOCOMPLETE_LIMIT:
+                    break
+        return choices
+
     async def launch_edit(self, interaction: discord.Interaction, event_id: int):
-        events = await database.get_all_events(interaction.guild.id)
-        target = next((e for e in events if e['id'] == event_id), None)
+        target = await database.get_event(event_id, interaction.guild.id)
         
         if not target:
             await interaction.response.send_message("❌ Event not found.", ephemeral=True)
@@ -356,9 +519,13 @@ class Events(commands.Cog):
             'duration': target['duration'] if 'duration' in target.keys() else 0
         }
         
-        view = EventCreationView(mode="edit", event_id=event_id, default_values=defaults)
+        series_id = target['series_id'] if 'series_id' in target.keys() else None
+        view = EventCreationView(mode="edit", event_id=event_id, default_values=defaults, series_id=series_id)
+        msg = f"🛠️ **Updating Event #{event_id}**\nPlease select the new Name and Repeat settings, then click Next."
+        if series_id:
+            msg += "\nThis event repeats: the buttons below apply to every occurrence in the series."
         await interaction.response.send_message(
-            f"🛠️ **Updating Event #{event_id}**\nPlease select the new Name and Repeat settings, then click Next.", 
+            msg, 
             view=view, 
             ephemeral=True
         )
@@ -384,25 +551,59 @@ class Events(commands.Cog):
         if not interaction.guild: return
         limit = max(1, min(limit, 20))
 
-        events = await database.get_all_events(interaction.guild.id)
-        if not events:
+        embeds = await self.get_list_embeds(interaction.guild.id, limit)
+        if not embeds:
             await interaction.response.send_message("No upcoming events.", ephemeral=True)
             return
 
+        await interaction.response.send_message(embeds=embeds)
+
+    async def get_list_embeds(self, guild_id: int, limit: int):
+        """
+        Returns the /list embeds for a guild, shared between concurrent callers.
+        Identical requests wait on the same render; results are cached for LIST_CACHE_TTL
+        seconds or until an event write in the guild bumps its version.
+        """
+        key = (guild_id, limit)
+        version = database.get_guild_version(guild_id)
+
+        cached = self._list_cache.get(key)
+        if cached:
+            expires_at, cached_version, embeds = cached
+            if cached_version == version and time.monotonic() < expires_at:
+                return embeds
+            del self._list_cache[key]
+
+        task = self._list_inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self.render_list_embeds(guild_id, limit))
+            self._list_inflight[key] = task
+            try:
+                embeds = await asyncio.shield(task)
+            finally:
+                self._list_inflight.pop(key, None)
+
+            # Only cache if no write landed while we were rendering
+            if database.get_guild_version(guild_id) == version:
+                self._list_cache[key] = (time.monotonic() + LIST_CACHE_TTL, version, embeds)
+            return embeds
+
+        return await asyncio.shield(task)
+
+    async def render_list_embeds(self, guild_id: int, limit: int):
+        events = await database.get_all_events(guild_id)
+        if not events:
+            return []
+
         embeds = []
         mapping = EventConfig.get_legacy_mapping()
-        
-        # Pre-process ALL events for conflict check (O(N^2) but N=20 max due to limit? No, limit is display, we need all for robust check)
-        # Actually, verifying against *upcoming* events is enough.
-        # Let's check overlap within the displayed set + any others fetched?
-        # get_all_events returns everything sorted by time.
-        
-        for i, event in enumerate(events[:limit]):
-            try:
-                dt = datetime.datetime.strptime(event['event_time'], "%Y-%m-%d %H:%M:%S")
-            except ValueError:
-                dt = datetime.datetime.strptime(event['event_time'], "%Y-%m-%d %H:%M:%S.%f")
-            
+
+        # Conflict flags are maintained on write (event_conflicts), only the shown events are looked up
+        shown = events[:limit]
+        conflicts = await database.get_event_conflicts(guild_id, [event['id'] for event in shown])
+
+        for event in shown:
+            dt = database.parse_event_time(event['event_time'])
             unix_ts = int(dt.replace(tzinfo=datetime.timezone.utc).timestamp())
             
             e_type = event['event_type'] if event['event_type'] else "General"
@@ -410,26 +611,8 @@ class Events(commands.Cog):
             
             color, icon = EventConfig.get_event_metadata(e_type)
             
-            # Check for conflict with ANY other event in the full list
-            has_conflict = False
-            my_dur = event['duration'] if 'duration' in event.keys() else 0
-            my_end = dt + datetime.timedelta(minutes=my_dur)
-            
-            for other in events:
-                if other['id'] == event['id']: continue
-                
-                try:
-                    o_dt = datetime.datetime.strptime(other['event_time'], "%Y-%m-%d %H:%M:%S")
-                except ValueError:
-                    o_dt = datetime.datetime.strptime(other['event_time'], "%Y-%m-%d %H:%M:%S.%f")
-                
-                o_dur = other['duration'] if 'duration' in other.keys() else 0
-                o_end = o_dt + datetime.timedelta(minutes=o_dur)
-                
-                # Overlap check
-                if (dt < o_end) and (my_end > o_dt):
-                    has_conflict = True
-                    break
+            has_conflict = event['id'] in conflicts
+            my_dur = event['duration'] or 0
             
             title_prefix = ""
             if has_conflict:
@@ -453,12 +636,134 @@ class Events(commands.Cog):
             
             embeds.append(embed)
         
-        await interaction.response.send_message(embeds=embeds)
+        return embeds
+
+    @app_commands.command(name="search", description="Search events by name or description")
+    @app_commands.describe(query="Words to look for (English or 中文)", limit="Number of results (default 10, max 25)")
+    async def search_events(self, interaction: discord.Interaction, query: str, limit: int = 10):
+        if not interaction.guild: return
+        limit = max(1, min(limit, 25))
+
+        results = await database.search_events(interaction.guild.id, query, limit)
+        if not results:
+            await interaction.response.send_message(f"🔍 No events match `{query}`.", ephemeral=True)
+            return
+
+        mapping = EventConfig.get_legacy_mapping()
+        lines = []
+        for event in results:
+            unix_ts = int(database.parse_event_time(event['event_time']).replace(tzinfo=datetime.timezone.utc).timestamp())
+            name = mapping.get(event['name'], event['name'])
+            line = f"`{event['id']}` **{name}** · <t:{unix_ts}:f> (<t:{unix_ts}:R>)"
+            if event['snippet'] and event['snippet'] != event['name']:
+                line += f"\n> {event['snippet']}"
+            lines.append(line)
+
+        embed = discord.Embed(
+            title=f"🔍 Search / 搜尋: {query}"[:256],
+            description="\n".join(lines)[:4096],
+            color=0x3498db
+        )
+        embed.set_footer(text=f"{len(results)} result(s)")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="history", description="Show past events for a month")
+    @app_commands.describe(month="YYYY-MM (default: this month)", limit="Most recent events to list (default 20, max 50)")
+    async def history(self, interaction: discord.Interaction, month: Optional[str] = None, limit: int = 20):
+        if not interaction.guild: return
+        limit = max(1, min(limit, 50))
+        try:
+            start = datetime.datetime.strptime(month, "%Y-%m") if month else datetime.datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        except ValueError:
+            await interaction.response.send_message("❌ Month must look like `2025-10`.", ephemeral=True)
+            return
+        end = (start + datetime.timedelta(days=32)).replace(day=1)
+
+        events = await database.get_event_history(interaction.guild.id, start, end)
+        label = start.strftime("%Y-%m")
+        if not events:
+            await interaction.response.send_message(f"📜 No past events in {label}.", ephemeral=True)
+            return
+
+        mapping = EventConfig.get_legacy_mapping()
+        totals = {}
+        for event in events:
+            name = mapping.get(event['name'], event['name'])
+            totals[name] = totals.get(name, 0) + 1
+
+        lines = []
+        for event in reversed(events[-limit:]):
+            unix_ts = int(database.parse_event_time(event['event_time']).replace(tzinfo=datetime.timezone.utc).timestamp())
+            lines.append(f"`{event['id']}` **{mapping.get(event['name'], event['name'])}** · <t:{unix_ts}:f>")
+
+        embed = discord.Embed(
+            title=f"📜 History / 歷史: {label}",
+            description="\n".join(lines)[:4096],
+            color=0x95a5a6
+        )
+        embed.add_field(
+            name="Totals / 總計",
+            value="\n".join(f"{name}: **{count}**" for name, count in sorted(totals.items(), key=lambda item: -item[1]))[:1024],
+            inline=False
+        )
+        embed.set_footer(text=f"{len(events)} event(s), showing the latest {min(limit, len(events))}")
+        await interaction.response.send_message(embed=embed)
+
+    @app_commands.command(name="export", description="Export this server's schedule as a file")
+    @app_commands.describe(format="csv, json or ics (calendar apps)")
+    async def export_events(self, interaction: discord.Interaction, format: Literal["csv", "json", "ics"] = "csv"):
+        if not interaction.guild: return
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        # Stream rows from the cursor into a temp file so large schedules never sit in memory
+        with tempfile.TemporaryFile() as raw:
+            text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+            count = await database.export_events(interaction.guild.id, text, format)
+            text.flush()
+            text.detach()
+            raw.seek(0)
+            file = discord.File(raw, filename=f"schedule-{interaction.guild.id}.{format}")
+            await interaction.followup.send(f"📤 Exported {count} event(s).", file=file, ephemeral=True)
+
+    @app_commands.command(name="import", description="Import events from a csv, json or ics file (Admin)")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def import_events(self, interaction: discord.Interaction, file: discord.Attachment):
+        if not interaction.guild: return
+        fmt = os.path.splitext(file.filename)[1].lstrip(".").lower()
+        if fmt not in ("csv", "json", "ics"):
+            await interaction.response.send_message("❌ Unsupported file type. Use `.csv`, `.json` or `.ics`.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        started = time.perf_counter()
+        with tempfile.TemporaryFile() as raw:
+            await file.save(raw)
+            raw.seek(0)
+            text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+            try:
+                stats = await database.import_events(interaction.guild.id, database.iter_import_rows(text, fmt))
+            except ValueError as e:
+                await interaction.followup.send(f"❌ Could not read file: {e}", ephemeral=True)
+                return
+
+        msg = (f"📥 Imported **{stats['imported']}** event(s) in {time.perf_counter() - started:.1f}s"
+               f"\nSkipped {stats['duplicates']} duplicate(s), {len(stats['errors'])} error(s).")
+        if stats["errors"]:
+            msg += "\n```\n" + "\n".join(stats["errors"]) + "\n```"
+        await interaction.followup.send(msg, ephemeral=True)
 
     @app_commands.command(name="delete", description="Delete an event")
+    @app_commands.describe(event_id="Start typing a name, time or ID")
     async def delete_event(self, interaction: discord.Interaction, event_id: int):
-        await database.delete_event(event_id)
+        if not interaction.guild: return
+        if not await database.delete_event(event_id, interaction.guild.id):
+            await interaction.response.send_message("❌ Event not found.", ephemeral=True)
+            return
         await interaction.response.send_message(f"🗑️ Deleted event {event_id}.")
 
+    @delete_event.autocomplete("event_id")
+    async def delete_event_id_autocomplete(self, interaction: discord.Interaction, current: str):
+        return await self.event_id_choices(interaction, current)
+
 async def setup(bot):
     await bot.add_cog(Events(bot))
@@ -1,38 +1,316 @@
 import discord
 from discord.ext import commands, tasks
+import asyncio
 import datetime
 import database
+import logging
 import os
+import time
 from constants import EventConfig
 
+logger = logging.getLogger(__name__)
+
+# Catch-up after downtime: reminders later than this are summarized instead of delivered
+CATCHUP_MAX_LATENESS = int(os.getenv("CATCHUP_MAX_LATENESS_MINUTES", "10"))
+# Max concurrent Discord calls during startup prefetch and catch-up
+STARTUP_CONCURRENCY = int(os.getenv("STARTUP_CONCURRENCY", "5"))
+
+# Outbox drain: batch size, retry backoff (seconds) and attempts before an entry is marked dead
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_BASE_BACKOFF = 5
+OUTBOX_MAX_BACKOFF = 300
+OUTBOX_MAX_ATTEMPTS = 5
+
+# Adaptive tick interval: as short as TICK_MIN_SECONDS when a reminder is close, up to TICK_MAX_SECONDS
+# when nothing is pending (event writes wake the loop early). Work in one tick stops after TICK_BUDGET_SECONDS
+# and the remainder runs on the next, immediate tick.
+TICK_MIN_SECONDS = float(os.getenv("TICK_MIN_SECONDS", "5"))
+TICK_MAX_SECONDS = float(os.getenv("TICK_MAX_SECONDS", "300"))
+TICK_BUDGET_SECONDS = float(os.getenv("TICK_BUDGET_SECONDS", "30"))
+# Wake slightly after the due time so the reminder is certainly due when the tick reads the clock
+TICK_SLACK_SECONDS = 0.5
+CLEANUP_INTERVAL = datetime.timedelta(minutes=5)
+
+def plan_interval(now, next_due, tick_seconds):
+    """
+    Decides when the next tick starts. Returns (seconds from the start of this tick, reason).
+    The interval always includes the tick's own duration, so an overrunning tick is followed by a
+    gap instead of a back-to-back run.
+    """
+    if next_due is None:
+        wait, reason = TICK_MAX_SECONDS, "idle"
+    else:
+        wait = (next_due - now).total_seconds() + TICK_SLACK_SECONDS
+        if wait <= TICK_SLACK_SECONDS:
+            reason = "backlog"
+        elif wait < TICK_MAX_SECONDS:
+            reason = "due"
+        else:
+            reason = "idle"
+        wait = min(max(wait, TICK_MIN_SECONDS), TICK_MAX_SECONDS)
+    return tick_seconds + wait, reason
+
+# Reminders due together in one channel go out as one message: Discord allows 10 embeds
+# and 6000 characters of embed text per message
+DIGEST_MAX_EMBEDS = 10
+DIGEST_MAX_CHARS = 6000
+
+def chunk_digest(pairs):
+    """Splits [(item, embed)] into message-sized chunks, keeping their order."""
+    chunk, size = [], 0
+    for item, embed in pairs:
+        length = len(embed)
+        if chunk and (len(chunk) >= DIGEST_MAX_EMBEDS or size + length > DIGEST_MAX_CHARS):
+            yield chunk
+            chunk, size = [], 0
+        chunk.append((item, embed))
+        size += length
+    if chunk:
+        yield chunk
+
 class Scheduler(commands.Cog):
-    def __init__(self, bot):
+    def __init__(self, bot, clock=None, autostart=True):
         self.bot = bot
-        self.check_reminders.start()
-        print("✅ Scheduler initialized - reminder checking will start in 1 minute")
+        # Returns the current time as naive UTC (the format stored in the DB); injectable for simulations
+        self.clock = clock or datetime.datetime.utcnow
+        # channel_id -> channel, for channels not held in discord.py's own cache
+        self.channels = {}
+        # Held for the duration of a tick (and of catch-up) so passes never overlap
+        self._tick_lock = asyncio.Lock()
+        self._tick_started_at = None # wall clock, for waking the sleeping loop early
+        self._last_cleanup = None
+        self.metrics = {
+            "ticks": 0,
+            "overlaps_skipped": 0,
+            "overruns": 0, # ticks longer than the interval planned before them
+            "sliced_drains": 0, # drains cut short by TICK_BUDGET_SECONDS
+            "early_wakeups": 0,
+            "last_tick_ms": 0.0,
+            "avg_tick_ms": 0.0,
+            "max_tick_ms": 0.0,
+            "interval_s": 60.0,
+            "interval_reason": "startup",
+            "next_due_at": None,
+        }
+        database.add_write_listener(self.on_schedule_changed)
+        if autostart:
+            self.check_reminders.start()
+            logger.info("✅ Scheduler initialized - reminder checking will start in 1 minute")
 
     def cog_unload(self):
+        database.remove_write_listener(self.on_schedule_changed)
         self.check_reminders.cancel()
 
-    async def send_reminder_embed(self, channel, event, minutes_left, alert_type="Normal"):
-        """Helper to send the Card-style reminder"""
-        # Parse time
-        try:
-            dt = datetime.datetime.strptime(event['event_time'], "%Y-%m-%d %H:%M:%S")
-        except ValueError:
-            dt = datetime.datetime.strptime(event['event_time'], "%Y-%m-%d %H:%M:%S.%f")
-        
+    def on_schedule_changed(self, guild_id):
+        """An event was written: if the loop is sleeping past TICK_MIN_SECONDS, bring the next tick forward."""
+        if self._tick_lock.locked() or self._tick_started_at is None or not self.check_reminders.is_running():
+            return
+        since_start = (discord.utils.utcnow() - self._tick_started_at).total_seconds()
+        wake = since_start + TICK_MIN_SECONDS
+        if wake < self.metrics["interval_s"]:
+            self.metrics["early_wakeups"] += 1
+            self.set_interval(wake, "write")
+
+    def set_interval(self, seconds, reason):
+        self.metrics["interval_s"] = round(seconds, 2)
+        self.metrics["interval_reason"] = reason
+        if self.check_reminders.is_running():
+            self.check_reminders.change_interval(seconds=seconds)
+
+    def minutes_until(self, event):
+        """Minutes from now until the event starts (negative once it has started)."""
+        # Stored time IS UTC (per user intent), as is the clock
+        event_time = database.parse_event_time(event.event_time)
+        return (event_time - self.clock()).total_seconds() / 60
+
+    async def resolve_channel(self, channel_id):
+        channel = self.bot.get_channel(channel_id) or self.channels.get(channel_id)
+        if not channel:
+            channel = await self.bot.fetch_channel(channel_id)
+            self.channels[channel_id] = channel
+        return channel
+
+    async def prefetch_channels(self):
+        """Resolves every configured announcement channel concurrently so the first tick never fetches serially."""
+        settings = await database.get_all_guild_channels()
+        semaphore = asyncio.Semaphore(STARTUP_CONCURRENCY)
+
+        async def fetch(guild_id, channel_id):
+            async with semaphore:
+                try:
+                    await self.resolve_channel(channel_id)
+                except Exception as e:
+                    logger.error("❌ Error prefetching channel %s for guild %s: %s", channel_id, guild_id, e)
+
+        await asyncio.gather(*(fetch(guild_id, channel_id) for guild_id, channel_id in settings))
+        logger.info("📡 [SCHEDULER] Prefetched %d announcement channel(s)", len(settings))
+
+    async def catch_up(self):
+        """
+        Handles reminders whose fire time passed while the bot was down.
+        Reminders at most CATCHUP_MAX_LATENESS minutes late (and whose event hasn't started) go through
+        the outbox like any other due reminder; the rest are listed in one summary message per guild.
+        """
+        now = self.clock()
+        missed = await database.get_missed_reminders(now)
+
+        cutoff = now - datetime.timedelta(minutes=CATCHUP_MAX_LATENESS)
+        summarize = {}
+        for event in missed:
+            if self.is_stale(event, cutoff):
+                summarize.setdefault(event.guild_id, []).append(event)
+
+        semaphore = asyncio.Semaphore(STARTUP_CONCURRENCY)
+
+        async def summarize_guild(guild_id, events):
+            async with semaphore:
+                try:
+                    channel_id = await database.get_guild_channel(guild_id)
+                    if channel_id:
+                        channel = await self.resolve_channel(channel_id)
+                        await self.send_missed_summary(channel, events)
+                except Exception as e:
+                    logger.error("❌ Error sending missed summary for guild %s: %s", guild_id, e)
+                for event in events:
+                    await database.mark_reminder_sent(event.reminder_id)
+
+        await asyncio.gather(*(summarize_guild(guild_id, events) for guild_id, events in summarize.items()))
+
+        # Whatever is still due is recent enough to deliver
+        async with self._tick_lock:
+            queued = await database.enqueue_due_reminders(now)
+            delivered = await self.drain_outbox(concurrency=STARTUP_CONCURRENCY)
+        skipped = sum(len(events) for events in summarize.values())
+        logger.info("🩹 [SCHEDULER] Catch-up: queued %d, delivered %d late reminder(s), summarized %d", queued, delivered, skipped)
+
+    async def drain_outbox(self, concurrency=1, deadline=None):
+        """
+        Sends pending outbox entries in batches and acknowledges them by id once Discord accepts them.
+        Reminders in a batch that share a channel are coalesced into digest messages (one ping each).
+        Failures are rescheduled with exponential backoff; a 429 stops the drain until the next tick,
+        as does passing `deadline` (time.perf_counter()). Returns the number of reminders delivered.
+        Entries that went stale while queued (a crash before the ack, or a retry landing late) get the
+        same treatment as in catch_up: listed in a missed summary and acknowledged, never pinged.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        channel_ids = {}
+        delivered = 0
+        rate_limited = False
+
+        async def deliver(channel_id, chunk):
+            nonlocal delivered, rate_limited
+            async with semaphore:
+                if rate_limited:
+                    return
+                items = [item for item, _ in chunk]
+                try:
+                    channel = await self.resolve_channel(channel_id)
+                    for item in items:
+                        offset = item.offset_minutes
+                        if EventConfig.is_shield(item.name) and offset and offset > 5:
+                            logger.info("🛡️ Sending %sm Shield Alert for %s", offset, item.name)
+                        else:
+                            logger.info("⚡ Sending %sm reminder for %s", offset, item.name)
+
+                    await self.send_reminder_digest(channel, chunk)
+                    await database.ack_outbox([item.outbox_id for item in items], self.clock())
+                    delivered += len(items)
+
+                except Exception as e:
+                    is_rate_limit = isinstance(e, discord.RateLimited) or (isinstance(e, discord.HTTPException) and e.status == 429)
+                    rate_limited = rate_limited or is_rate_limit
+                    for item in items:
+                        delay = min(OUTBOX_MAX_BACKOFF, OUTBOX_BASE_BACKOFF * 2 ** item.attempts)
+                        if isinstance(e, discord.RateLimited):
+                            delay = e.retry_after
+                        logger.error("❌ Error delivering outbox entry %s (retry in %.0fs): %s", item.outbox_id, delay, e)
+                        await database.retry_outbox(item.outbox_id, str(e), delay, OUTBOX_MAX_ATTEMPTS, self.clock())
+
+        while not rate_limited:
+            if deadline is not None and time.perf_counter() >= deadline:
+                # Out of time: what's left is still pending and makes the next tick come right away
+                self.metrics["sliced_drains"] += 1
+                logger.warning("⏱️ [SCHEDULER] Tick budget used up, continuing the outbox next tick")
+                break
+            batch = await database.fetch_outbox_batch(OUTBOX_BATCH_SIZE, self.clock())
+            if not batch:
+                break
+            # Text columns are only loaded for the reminders actually being sent
+            descriptions = await database.get_event_descriptions({item.event_id for item in batch})
+
+            by_channel = {}
+            stale = {}
+            dropped = []
+            cutoff = self.clock() - datetime.timedelta(minutes=CATCHUP_MAX_LATENESS)
+            for item in batch:
+                # Event deleted after it was queued, or no channel configured: nothing to send
+                if item.event_time is None:
+                    dropped.append(item.outbox_id)
+                    continue
+                guild_id = item.guild_id
+                if guild_id not in channel_ids:
+                    channel_ids[guild_id] = await database.get_guild_channel(guild_id)
+                if not channel_ids[guild_id]:
+                    dropped.append(item.outbox_id)
+                    continue
+                if self.is_stale(item, cutoff):
+                    stale.setdefault(channel_ids[guild_id], []).append(item)
+                    continue
+                embed = self.build_reminder_embed(item, self.minutes_until(item), descriptions.get(item.event_id))
+                by_channel.setdefault(channel_ids[guild_id], []).append((item, embed))
+            await database.ack_outbox(dropped, self.clock())
+
+            await asyncio.gather(*(
+                deliver(channel_id, chunk)
+                for channel_id, pairs in by_channel.items()
+                for chunk in chunk_digest(pairs)
+            ))
+            for channel_id, items in stale.items():
+                try:
+                    await self.send_missed_summary(await self.resolve_channel(channel_id), items)
+                except Exception as e:
+                    logger.error("❌ Error sending missed summary to channel %s: %s", channel_id, e)
+                await database.ack_outbox([item.outbox_id for item in items], self.clock())
+                logger.info("🩹 Summarized %d stale outbox entry(s) instead of pinging", len(items))
+            if len(batch) < OUTBOX_BATCH_SIZE:
+                break
+
+        return delivered
+
+    def is_stale(self, event, cutoff):
+        """Too late to ping for: the event has started, or the reminder fired before `cutoff`."""
+        if self.minutes_until(event) <= 0:
+            return True
+        return event.fire_at is not None and database.parse_event_time(event.fire_at) < cutoff
+
+    async def send_missed_summary(self, channel, events):
+        """One message listing reminders that were too late to deliver individually."""
+        lines = []
+        for event in events[:15]:
+            dt = database.parse_event_time(event.event_time)
+            unix_ts = int(dt.replace(tzinfo=datetime.timezone.utc).timestamp())
+            lines.append(f"- **{event.name}** <t:{unix_ts}:F> (<t:{unix_ts}:R>)")
+        if len(events) > 15:
+            lines.append(f"... and {len(events) - 15} more")
+
+        embed = discord.Embed(
+            title="📋 Missed reminders while offline / 離線期間錯過的提醒",
+            description="\n".join(lines),
+            color=EventConfig.DEFAULT_COLOR
+        )
+        await channel.send(embed=embed)
+
+    def build_reminder_embed(self, event, minutes_left, description=None):
+        """Card-style reminder embed for one event."""
+        dt = database.parse_event_time(event.event_time)
         unix_ts = int(dt.replace(tzinfo=datetime.timezone.utc).timestamp())
         
         # Get metadata from Constants (consistent logic)
         # Note: Event name from DB is "Bear / 熊" hopefully. 
         # But if it's "Bear", get_event_metadata handles mapping.
-        color, icon = EventConfig.get_event_metadata(event['name'])
-        
-        # Urgency override
-        e_type = event['event_type']
+        color, icon = EventConfig.get_event_metadata(event.name)
         
-        if minutes_left <= 15 and "Shield" in event['name']:
+        if minutes_left <= 15 and EventConfig.is_shield(event.name):
             title_prefix = "🚨 URGENT SHIELD ALERT / 護盾緊急提醒"
             color = 0xff0000
         elif minutes_left <= 5:
@@ -42,102 +320,104 @@ class Scheduler(commands.Cog):
             title_prefix = f"🔔 Reminder / 提醒 ({int(minutes_left)}m)"
 
         embed = discord.Embed(
-            title=f"{title_prefix}: {event['name']}",
-            description=event['description'] or "No description",
+            title=f"{title_prefix}: {event.name}",
+            description=description or "No description",
             color=color
         )
         embed.set_thumbnail(url=icon)
         
         # Grid Layout
         embed.add_field(name="⏰ Time / 時間", value=f"<t:{unix_ts}:F>\n<t:{unix_ts}:R>", inline=True)
-             
-        # Ping
-        content = "@everyone"
-        
-        await channel.send(content=content, embed=embed)
+        return embed
+
+    async def send_reminder_embed(self, channel, event, minutes_left, description=None):
+        """Sends a single reminder card with its own ping."""
+        embed = self.build_reminder_embed(event, minutes_left, description)
+        await self.send_reminder_digest(channel, [(event, embed)])
 
+    async def send_reminder_digest(self, channel, chunk):
+        """Sends up to DIGEST_MAX_EMBEDS reminder cards, given as [(event, embed)], in one message with one ping."""
+        await channel.send(content="@everyone", embeds=[embed for _, embed in chunk])
 
     @tasks.loop(minutes=1)
     async def check_reminders(self):
         await self.bot.wait_until_ready()
-        
-        try:
-            print(f"\n🔍 [SCHEDULER] check at {datetime.datetime.now().strftime('%H:%M:%S')}")
-            
-            # Cleanup FIRST
-            try:
-                await database.delete_old_events()
-            except Exception as e:
-                print(f"❌ Error deleting old events: {e}")
+        await self.run_tick()
 
-            events = await database.get_upcoming_reminders()
-            
-            for event in events:
-                try:
-                    guild_id = event['guild_id']
-                    if not guild_id: continue
-                        
-                    channel_id = await database.get_guild_channel(guild_id)
-                    if not channel_id: continue
+    async def run_tick(self):
+        """
+        One scheduler pass: periodic cleanup, queue due reminders, drain the outbox (within the tick budget),
+        then plan the next tick from the earliest pending work. Never runs concurrently with another pass.
+        """
+        if self._tick_lock.locked():
+            self.metrics["overlaps_skipped"] += 1
+            logger.warning("⏭️ [SCHEDULER] Previous tick still running, skipping")
+            return
 
+        async with self._tick_lock:
+            started = time.perf_counter()
+            self._tick_started_at = discord.utils.utcnow()
+            next_due = None
+            failed = False
+            try:
+                logger.debug("🔍 [SCHEDULER] check")
+                now = self.clock()
+                
+                # Cleanup first, but only every CLEANUP_INTERVAL now that ticks can be seconds apart
+                if self._last_cleanup is None or now - self._last_cleanup >= CLEANUP_INTERVAL:
                     try:
-                        channel = self.bot.get_channel(channel_id)
-                        if not channel:
-                            channel = await self.bot.fetch_channel(channel_id)
+                        archived = await database.archive_old_events(now)
+                        if archived:
+                            logger.info("🗄️ Archived %d past event(s)", archived)
                     except Exception as e:
-                        print(f"❌ Error getting channel: {e}")
-                        continue
+                        logger.error("❌ Error archiving old events: %s", e)
+                    self._last_cleanup = now
 
-                    try:
-                        # Parse naive datetime from DB
-                        dt_naive = datetime.datetime.strptime(event['event_time'], "%Y-%m-%d %H:%M:%S")
-                    except ValueError:
-                        try:
-                            dt_naive = datetime.datetime.strptime(event['event_time'], "%Y-%m-%d %H:%M:%S.%f")
-                        except ValueError:
-                            dt_naive = datetime.datetime.strptime(event['event_time'], "%Y-%m-%d %H:%M") # fallback
-
-                    # Assume stored time IS UTC (per user intent), so make it aware
-                    event_time = dt_naive.replace(tzinfo=datetime.timezone.utc)
-                    
-                    # Compare with UTC now
-                    now = datetime.datetime.now(datetime.timezone.utc)
-                    
-                    time_diff = event_time - now
-                    minutes_diff = time_diff.total_seconds() / 60
-                    
-                    # Use dictionary access (Fixed Bug)
-                    e_type = event['event_type']
-                    name = event['name']
-                    
-                    # 30 Minute Reminder (Normal)
-                    is_shield = "Shield" in name
-                    
-                    # 30 Minute Reminder (Removed per user request)
-                    # is_shield = "Shield" in name
-                    # if not is_shield and 25 <= minutes_diff <= 35 and not event['reminder_30_sent']: ...
-
-                    # 15 Minute Reminder (Shield Only)
-                    if is_shield and 10 <= minutes_diff <= 20 and not event['reminder_30_sent']:
-                        print(f"  🛡️ Sending 15m Shield Alert for {event['name']}")
-                        await self.send_reminder_embed(channel, event, minutes_diff)
-                        await database.mark_reminder_sent(event['id'], "30") # Reuse column for tracking
-
-                    # 5 Minute Reminder (All)
-                    elif 0 < minutes_diff <= 5 and not event['reminder_5_sent']:
-                        print(f"  ⚡ Sending 5m reminder for {event['name']}")
-                        await self.send_reminder_embed(channel, event, minutes_diff)
-                        await database.mark_reminder_sent(event['id'], "5")
-                        
-                except Exception as e:
-                    print(f"❌ Error processing event {event.get('id', '?')}: {e}")
-                    import traceback
-                    traceback.print_exc()
+                # Queue due reminders atomically, then deliver from the outbox
+                queued = await database.enqueue_due_reminders(now)
+                if queued:
+                    logger.info("📬 Queued %d reminder(s)", queued)
+                await self.drain_outbox(deadline=started + TICK_BUDGET_SECONDS)
+
+                next_due = await database.get_next_due_at(self.clock())
+
+            except Exception as e:
+                failed = True
+                logger.exception("❌ Fatal Scheduler Error: %s", e)
 
+            elapsed = time.perf_counter() - started
+            self.record_tick(elapsed)
+            if failed:
+                # Don't trust next_due; retry at the old one-minute cadence
+                interval, reason = elapsed + 60, "error"
+            else:
+                interval, reason = plan_interval(self.clock(), next_due, elapsed)
+            self.metrics["next_due_at"] = str(next_due) if next_due else None
+            self.set_interval(interval, reason)
+
+    def record_tick(self, elapsed):
+        metrics = self.metrics
+        if elapsed > metrics["interval_s"]:
+            metrics["overruns"] += 1
+            logger.warning("🐢 [SCHEDULER] Tick took %.1fs, longer than its %.0fs interval", elapsed, metrics["interval_s"])
+        metrics["ticks"] += 1
+        ms = elapsed * 1000
+        metrics["last_tick_ms"] = round(ms, 1)
+        metrics["max_tick_ms"] = round(max(metrics["max_tick_ms"], ms), 1)
+        # Moving average over roughly the last 20 ticks
+        metrics["avg_tick_ms"] = round(metrics["avg_tick_ms"] + (ms - metrics["avg_tick_ms"]) / min(metrics["ticks"], 20), 1)
+
+    @check_reminders.before_loop
+    async def before_check_reminders(self):
+        """Startup phase: make sure the schema is migrated, warm the channel cache, then recover reminders missed during downtime."""
+        await self.bot.wait_until_ready()
+        try:
+            # Never trust on_ready ordering: catch-up must not query reminders/outbox before they exist
+            await database.init_db()
+            await self.prefetch_channels()
+            await self.catch_up()
         except Exception as e:
-            print(f"❌ Fatal Scheduler Error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Scheduler startup error: %s", e)
 
 async def setup(bot):
     await bot.add_cog(Scheduler(bot))
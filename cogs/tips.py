@@ -2,6 +2,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import os
+import assets
 
 class Tips(commands.Cog):
     def __init__(self, bot):
@@ -86,8 +87,9 @@ class Tips(commands.Cog):
 
         count = 0
         try:
-            for filename in files:
-                file_path = os.path.join(img_dir, filename)
+            # Upload the optimized variants (encoded once, then served from the on-disk cache)
+            variants = await assets.prepare([os.path.join(img_dir, filename) for filename in files])
+            for file_path, filename in variants:
                 with open(file_path, 'rb') as f:
                     picture = discord.File(f, filename=filename)
                     await target_thread.send(file=picture)
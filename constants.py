@@ -2,6 +2,7 @@ class EventConfig:
     # Default Fallback
     DEFAULT_COLOR = 0x3498db # Blue
     DEFAULT_ICON = "https://img.icons8.com/color/96/calendar--v1.png"
+    DEFAULT_REMINDERS = [5] # Minutes before start
 
     # Event Definitions
     # Key = Bifurcated Name (Stored in DB)
@@ -68,7 +69,8 @@ class EventConfig:
             "icon": "https://img.icons8.com/color/96/shield.png",
             "desc": "Urgent Alert",
             "legacy_keys": ["Shield"],
-            "duration": 0
+            "duration": 0,
+            "reminders": [15, 5]
         },
         "Farm / 採集": {
             "color": 0x2ecc71,
@@ -97,6 +99,28 @@ class EventConfig:
                  return data.get("duration", 0)
         return 0
 
+    @classmethod
+    def resolve_name(cls, event_name):
+        """Returns the EVENTS key for an event name or legacy name, or None for custom events."""
+        if event_name in cls.EVENTS:
+            return event_name
+        for name, data in cls.EVENTS.items():
+            if event_name in data["legacy_keys"]:
+                return name
+        return None
+
+    @classmethod
+    def get_reminder_offsets(cls, event_name):
+        """Returns reminder offsets (minutes before start, largest first) for a given event name."""
+        name = cls.resolve_name(event_name)
+        offsets = cls.EVENTS[name].get("reminders", cls.DEFAULT_REMINDERS) if name else cls.DEFAULT_REMINDERS
+        return sorted(offsets, reverse=True)
+
+    @classmethod
+    def is_shield(cls, event_name):
+        """True for the Shield event (or its legacy name), the one with the extra 15m alert tier."""
+        return cls.resolve_name(event_name) == "Shield / 護盾"
+
     @classmethod
     def get_event_metadata(cls, event_name):
         """Returns (color, icon) for a given event name (or legacy name)."""
@@ -1,15 +1,179 @@
 import aiosqlite
+import csv
 import datetime
+import functools
+import inspect
+import json
+import logging
 import os
+import sqlite3
+import uuid
+import zoneinfo
+from typing import NamedTuple, Optional
 from constants import EventConfig
 
-DB_NAME = "scheduler.db"
+logger = logging.getLogger(__name__)
 
+# Storage backend, read from the environment (.env) on first use:
+#   DB_BACKEND   sqlite (default) or memory (process-local, nothing persisted; for tests and simulations)
+#   DB_PATH      SQLite file or URI (default scheduler.db)
+# Assigning these module attributes overrides the environment (tests, benchmarks, simulate.py).
+DB_NAME = None
+DB_BACKEND = None
+_memory_store = None
+
+def db_path():
+    return DB_NAME or os.getenv("DB_PATH", "scheduler.db")
+
+def backend():
+    return (DB_BACKEND or os.getenv("DB_BACKEND", "sqlite")).lower()
+
+def use_backend(name: str, path: str = None):
+    """Switches the storage backend at runtime. Selecting "memory" always starts from an empty store."""
+    global DB_BACKEND, DB_NAME, _memory_store
+    DB_BACKEND = name
+    if path is not None:
+        DB_NAME = path
+    _memory_store = None
+
+def _memory():
+    global _memory_store
+    if _memory_store is None:
+        from memory_store import MemoryStore
+        _memory_store = MemoryStore()
+    return _memory_store
+
+def _pluggable(func):
+    """Routes a storage function to the in-memory engine when DB_BACKEND=memory; the body below is the SQLite one."""
+    name = func.__name__
+
+    def memory_impl():
+        impl = getattr(_memory(), name, None)
+        if impl is None:
+            raise NotImplementedError(f"{name} is not supported by the memory backend")
+        return impl
+
+    if inspect.isasyncgenfunction(func):
+        @functools.wraps(func)
+        async def generator_wrapper(*args, **kwargs):
+            source = memory_impl()(*args, **kwargs) if backend() == "memory" else func(*args, **kwargs)
+            async for item in source:
+                yield item
+        return generator_wrapper
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if backend() == "memory":
+            return await memory_impl()(*args, **kwargs)
+        return await func(*args, **kwargs)
+    return wrapper
+
+# Per-guild write counter, bumped on every event write so cached reads know when to invalidate
+_guild_versions = {}
+# Per-guild time of the last bump (for HTTP Last-Modified); guilds untouched since startup report the start time.
+# Whole seconds, like the header, and strictly increasing so a write never reuses a date already served
+_guild_modified = {}
+_started_at = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+
+def _connect():
+    # The path may be a SQLite URI, e.g. "file:sim?mode=memory&cache=shared" for in-memory runs
+    path = db_path()
+    return aiosqlite.connect(path, uri=path.startswith("file:"))
+
+def get_guild_version(guild_id: int):
+    return _guild_versions.get(guild_id, 0)
+
+def get_guild_last_modified(guild_id: int):
+    return _guild_modified.get(guild_id, _started_at)
+
+# Callbacks run with the guild_id after every event write (e.g. the scheduler waking up early)
+_write_listeners = []
+
+def add_write_listener(callback):
+    _write_listeners.append(callback)
+
+def remove_write_listener(callback):
+    if callback in _write_listeners:
+        _write_listeners.remove(callback)
+
+def _bump_guild_version(guild_id):
+    if guild_id is not None:
+        _guild_versions[guild_id] = _guild_versions.get(guild_id, 0) + 1
+        now = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+        previous = _guild_modified.get(guild_id, _started_at)
+        _guild_modified[guild_id] = max(now, previous + datetime.timedelta(seconds=1))
+        for callback in _write_listeners:
+            callback(guild_id)
+
+class ReminderRecord(NamedTuple):
+    """
+    Compact reminder as the scheduler sees it: ids, timing and type only.
+    Text-heavy columns (description, icon_url) are fetched separately, only for reminders actually being sent.
+    """
+    reminder_id: int
+    offset_minutes: int
+    fire_at: str
+    event_id: int
+    guild_id: int
+    event_time: str
+    event_type: str
+    name: str
+    outbox_id: Optional[int] = None
+    attempts: int = 0
+
+def _reminder_factory(cursor, row):
+    return ReminderRecord(*row)
+
+def parse_event_time(value):
+    """Accepts a datetime or a stored timestamp string and returns a naive datetime."""
+    if isinstance(value, datetime.datetime):
+        return value
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M"):
+        try:
+            return datetime.datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    try:
+        # ISO 8601 with a "T" separator and/or offset (imports)
+        parsed = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Unrecognised event time: {value!r}")
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return parsed
+
+# Longest event in minutes (the details modal takes 4 digits). Bounds the conflict neighbour search.
+MAX_EVENT_DURATION = 9999
+
+# events.end_time is derived from the start and duration, in the same text format as SQLite's datetime()
+END_TIME_SQL = "datetime(event_time, '+' || COALESCE(duration, 0) || ' minutes')"
+
+# Events of new's guild overlapping [new.event_time, new.end_time), for the conflict triggers
+_CONFLICT_NEIGHBOURS_SQL = f"""
+    FROM events
+    WHERE guild_id = new.guild_id AND id != new.id
+      AND event_time > datetime(new.event_time, '-{MAX_EVENT_DURATION} minutes') AND event_time < new.end_time
+      AND end_time > new.event_time
+"""
+
+async def _schedule_reminders(db, event_id, event_name, event_time):
+    """Creates one reminders row per configured offset for a freshly inserted event."""
+    event_time = parse_event_time(event_time)
+    rows = [
+        (event_id, offset, event_time - datetime.timedelta(minutes=offset))
+        for offset in EventConfig.get_reminder_offsets(event_name)
+    ]
+    await db.executemany(
+        "INSERT OR IGNORE INTO reminders (event_id, offset_minutes, fire_at) VALUES (?, ?, ?)",
+        rows
+    )
+
+@_pluggable
 async def init_db():
-    async with aiosqlite.connect(DB_NAME) as db:
+    async with _connect() as db:
         
         # Events table with guild_id
-        await db.execute("""
+        await db.execute(f"""
             CREATE TABLE IF NOT EXISTS events (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 guild_id INTEGER,
@@ -23,10 +187,64 @@ async def init_db():
                 repeat_config TEXT, -- '1d', '7d', 'None'
                 icon_url TEXT,
                 color_hex INTEGER,
-                duration INTEGER DEFAULT 0 -- Duration in minutes
+                duration INTEGER DEFAULT 0, -- Duration in minutes
+                series_id TEXT, -- Shared by the occurrences of a repeating event
+                end_time TIMESTAMP GENERATED ALWAYS AS ({END_TIME_SQL}) VIRTUAL
             )
         """)
         
+        # Reminders table: one row per (event, offset)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS reminders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                event_id INTEGER NOT NULL,
+                offset_minutes INTEGER NOT NULL, -- Minutes before event start
+                fire_at TIMESTAMP NOT NULL,
+                sent INTEGER DEFAULT 0,
+                UNIQUE (event_id, offset_minutes)
+            )
+        """)
+
+        # Outbox: reminders queued for delivery, acknowledged by id once sent
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                dedupe_key TEXT NOT NULL UNIQUE, -- '<event_id>:<offset_minutes>:<fire_at>', so a re-armed (shifted) reminder queues again
+                reminder_id INTEGER,
+                event_id INTEGER,
+                guild_id INTEGER,
+                status TEXT DEFAULT 'pending', -- 'pending', 'sent', 'dead'
+                attempts INTEGER DEFAULT 0,
+                next_attempt_at TIMESTAMP,
+                last_error TEXT,
+                created_at TIMESTAMP,
+                sent_at TIMESTAMP
+            )
+        """)
+
+        # Archive: past events moved out of events by archive_old_events, kept for /history.
+        # Clustered on (month, guild, time), so each month is one contiguous partition of the table
+        # and a guild's month is a single range read.
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS events_archive (
+                month TEXT NOT NULL, -- 'YYYY-MM' of event_time, the partition key
+                guild_id INTEGER NOT NULL,
+                event_time TIMESTAMP NOT NULL,
+                id INTEGER NOT NULL, -- The id the event had in events
+                name TEXT,
+                description TEXT,
+                event_type TEXT,
+                coordinates TEXT,
+                repeat_config TEXT,
+                icon_url TEXT,
+                color_hex INTEGER,
+                duration INTEGER DEFAULT 0,
+                series_id TEXT,
+                archived_at TIMESTAMP,
+                PRIMARY KEY (month, guild_id, event_time, id)
+            ) WITHOUT ROWID
+        """)
+
         # Guild settings table
         await db.execute("""
             CREATE TABLE IF NOT EXISTS guild_settings (
@@ -43,17 +261,104 @@ async def init_db():
             ("repeat_config", "TEXT"),
             ("icon_url", "TEXT"),
             ("color_hex", "INTEGER"),
-            ("duration", "INTEGER DEFAULT 0")
+            ("duration", "INTEGER DEFAULT 0"),
+            ("series_id", "TEXT"), # Shared by the occurrences of a repeating event
+            ("end_time", f"TIMESTAMP GENERATED ALWAYS AS ({END_TIME_SQL}) VIRTUAL")
         ]
         
         for col_name, col_type in columns_to_add:
             try:
                 await db.execute(f"ALTER TABLE events ADD COLUMN {col_name} {col_type}")
-                print(f"⚠️ Migrated DB: Added {col_name} column.")
+                logger.warning("⚠️ Migrated DB: Added %s column.", col_name)
             except Exception as e:
                 # Column likely exists
                 pass
 
+        # Indexes: due reminders are fetched by fire_at, listings by guild + time
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_reminders_due ON reminders(fire_at) WHERE sent = 0")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_events_guild_time ON events(guild_id, event_time)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_events_series ON events(series_id) WHERE series_id IS NOT NULL")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_outbox_pending ON outbox(next_attempt_at) WHERE status = 'pending'")
+
+        # Conflicts: one row per direction for every pair of overlapping events in a guild. Triggers keep it
+        # current on every insert/move/delete by re-checking only the neighbours of the changed interval,
+        # found with a two-sided range on idx_events_guild_time (no event is longer than MAX_EVENT_DURATION).
+        async with db.execute("SELECT 1 FROM sqlite_master WHERE name = 'event_conflicts'") as cursor:
+            conflicts_exist = await cursor.fetchone() is not None
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS event_conflicts (
+                event_id INTEGER NOT NULL,
+                other_id INTEGER NOT NULL,
+                PRIMARY KEY (event_id, other_id)
+            ) WITHOUT ROWID
+        """)
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_event_conflicts_other ON event_conflicts(other_id)")
+        link = _CONFLICT_NEIGHBOURS_SQL
+        await db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS events_conflicts_insert AFTER INSERT ON events BEGIN
+                INSERT INTO event_conflicts (event_id, other_id) SELECT new.id, id {link};
+                INSERT INTO event_conflicts (event_id, other_id) SELECT id, new.id {link};
+            END
+        """)
+        await db.execute("""
+            CREATE TRIGGER IF NOT EXISTS events_conflicts_delete AFTER DELETE ON events BEGIN
+                DELETE FROM event_conflicts WHERE event_id = old.id;
+                DELETE FROM event_conflicts WHERE other_id = old.id;
+            END
+        """)
+        await db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS events_conflicts_update AFTER UPDATE OF guild_id, event_time, duration ON events BEGIN
+                DELETE FROM event_conflicts WHERE event_id = old.id;
+                DELETE FROM event_conflicts WHERE other_id = old.id;
+                INSERT INTO event_conflicts (event_id, other_id) SELECT new.id, id {link};
+                INSERT INTO event_conflicts (event_id, other_id) SELECT id, new.id {link};
+            END
+        """)
+        if not conflicts_exist:
+            await db.execute("""
+                INSERT INTO event_conflicts (event_id, other_id)
+                SELECT a.id, b.id FROM events a
+                JOIN events b ON b.guild_id = a.guild_id AND b.id != a.id
+                    AND b.event_time < a.end_time AND b.end_time > a.event_time
+            """)
+            logger.warning("⚠️ Migrated DB: Built event conflict table.")
+
+        # Full-text index over name/description for /search. External content: the text lives only in
+        # events, triggers keep the index in step. Trigram tokens so Chinese text (no spaces) matches mid-word.
+        global _fts_enabled
+        async with db.execute("SELECT 1 FROM sqlite_master WHERE name = 'events_fts'") as cursor:
+            fts_exists = await cursor.fetchone() is not None
+        try:
+            await db.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+                    name, description, content='events', content_rowid='id', tokenize='trigram'
+                )
+            """)
+            await db.execute("""
+                CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN
+                    INSERT INTO events_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+                END
+            """)
+            await db.execute("""
+                CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN
+                    INSERT INTO events_fts(events_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+                END
+            """)
+            await db.execute("""
+                CREATE TRIGGER IF NOT EXISTS events_fts_update AFTER UPDATE OF name, description ON events BEGIN
+                    INSERT INTO events_fts(events_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+                    INSERT INTO events_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+                END
+            """)
+            if not fts_exists:
+                await db.execute("INSERT INTO events_fts(events_fts) VALUES ('rebuild')")
+                logger.warning("⚠️ Migrated DB: Built full-text search index.")
+            _fts_enabled = True
+        except aiosqlite.OperationalError as e:
+            # SQLite builds without FTS5/trigram (older than 3.34): /search falls back to LIKE
+            _fts_enabled = False
+            logger.warning("Full-text search unavailable, /search will scan: %s", e)
+
         # DATA MIGRATION: Backfill duration for existing events
         # We iterate known event types and update duration where it is 0
         for name, data in EventConfig.EVENTS.items():
@@ -64,33 +369,126 @@ async def init_db():
                 # Update for legacy keys
                 for key in data.get("legacy_keys", []):
                      await db.execute("UPDATE events SET duration = ? WHERE (name LIKE ? OR event_type = ?) AND (duration IS NULL OR duration = 0)", (duration, f"%{key}%", key))
-            
+
+        # DATA MIGRATION: Create reminder rows for upcoming events from before the reminders table.
+        # The legacy flags map onto the old tiers (reminder_30_sent tracked the 15m shield alert).
+        now = datetime.datetime.utcnow()
+        async with db.execute("""
+            SELECT id, name, event_time, reminder_30_sent, reminder_5_sent FROM events
+            WHERE event_time > ? AND id NOT IN (SELECT event_id FROM reminders)
+        """, (now,)) as cursor:
+            legacy_events = await cursor.fetchall()
+
+        for event_id, name, event_time, sent_30, sent_5 in legacy_events:
+            await _schedule_reminders(db, event_id, name, event_time)
+            if sent_30:
+                await db.execute("UPDATE reminders SET sent = 1 WHERE event_id = ? AND offset_minutes > 5", (event_id,))
+            if sent_5:
+                await db.execute("UPDATE reminders SET sent = 1 WHERE event_id = ? AND offset_minutes <= 5", (event_id,))
+        if legacy_events:
+            logger.warning("⚠️ Migrated DB: Scheduled reminders for %d existing events.", len(legacy_events))
+
         await db.commit()
 
+@_pluggable
 async def set_guild_channel(guild_id: int, channel_id: int):
-    async with aiosqlite.connect(DB_NAME) as db:
+    async with _connect() as db:
         await db.execute(
             "INSERT OR REPLACE INTO guild_settings (guild_id, announcement_channel_id) VALUES (?, ?)",
             (guild_id, channel_id)
         )
         await db.commit()
 
+@_pluggable
 async def get_guild_channel(guild_id: int):
-    async with aiosqlite.connect(DB_NAME) as db:
+    async with _connect() as db:
         async with db.execute("SELECT announcement_channel_id FROM guild_settings WHERE guild_id = ?", (guild_id,)) as cursor:
             row = await cursor.fetchone()
             return row[0] if row else None
 
-async def add_event(guild_id, name, event_time, description, event_type, coordinates, repeat_config, icon_url, color_hex, duration=0):
-    async with aiosqlite.connect(DB_NAME) as db:
+@_pluggable
+async def get_all_guild_channels():
+    """Returns (guild_id, announcement_channel_id) for every configured guild."""
+    async with _connect() as db:
+        async with db.execute(
+            "SELECT guild_id, announcement_channel_id FROM guild_settings WHERE announcement_channel_id IS NOT NULL"
+        ) as cursor:
+            return await cursor.fetchall()
+
+@_pluggable
+async def add_event(guild_id, name, event_time, description, event_type, coordinates, repeat_config, icon_url, color_hex, duration=0, series_id=None):
+    async with _connect() as db:
+        cursor = await db.execute("""
+            INSERT INTO events (guild_id, name, event_time, description, event_type, coordinates, repeat_config, icon_url, color_hex, duration, series_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (guild_id, name, event_time, description, event_type, coordinates, repeat_config, icon_url, color_hex, duration, series_id))
+        event_id = cursor.lastrowid
+        await _schedule_reminders(db, event_id, name, event_time)
+        await db.commit()
+    _bump_guild_version(guild_id)
+    return event_id
+
+@_pluggable
+async def add_series(guild_id, name, event_times, description, event_type, coordinates, repeat_config, icon_url, color_hex, duration=0):
+    """Inserts every occurrence of a repeating event in one transaction under a new series_id, which is returned."""
+    series_id = uuid.uuid4().hex
+    async with _connect() as db:
+        for event_time in event_times:
+            cursor = await db.execute("""
+                INSERT INTO events (guild_id, name, event_time, description, event_type, coordinates, repeat_config, icon_url, color_hex, duration, series_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (guild_id, name, event_time, description, event_type, coordinates, repeat_config, icon_url, color_hex, duration, series_id))
+            await _schedule_reminders(db, cursor.lastrowid, name, event_time)
+        await db.commit()
+    _bump_guild_version(guild_id)
+    return series_id
+
+# Series operations: one set-based statement per table, all in a single transaction. Each returns the number of events touched.
+
+@_pluggable
+async def delete_series(guild_id: int, series_id: str):
+    async with _connect() as db:
+        await db.execute("""
+            DELETE FROM reminders WHERE event_id IN (SELECT id FROM events WHERE guild_id = ? AND series_id = ?)
+        """, (guild_id, series_id))
+        cursor = await db.execute("DELETE FROM events WHERE guild_id = ? AND series_id = ?", (guild_id, series_id))
+        await db.commit()
+    _bump_guild_version(guild_id)
+    return cursor.rowcount
+
+@_pluggable
+async def shift_series(guild_id: int, series_id: str, minutes: int, now=None):
+    """Moves every occurrence (and its reminders) by `minutes`. Reminders pushed back into the future are re-armed."""
+    now = now or datetime.datetime.utcnow()
+    modifier = f"{minutes:+d} minutes"
+    async with _connect() as db:
+        # SET expressions see the old row, so the re-arm check computes the new fire_at itself
         await db.execute("""
-            INSERT INTO events (guild_id, name, event_time, description, event_type, coordinates, repeat_config, icon_url, color_hex, duration)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (guild_id, name, event_time, description, event_type, coordinates, repeat_config, icon_url, color_hex, duration))
+            UPDATE reminders
+            SET fire_at = datetime(fire_at, ?),
+                sent = CASE WHEN datetime(fire_at, ?) > ? THEN 0 ELSE sent END
+            WHERE event_id IN (SELECT id FROM events WHERE guild_id = ? AND series_id = ?)
+        """, (modifier, modifier, now, guild_id, series_id))
+        cursor = await db.execute("""
+            UPDATE events SET event_time = datetime(event_time, ?) WHERE guild_id = ? AND series_id = ?
+        """, (modifier, guild_id, series_id))
         await db.commit()
+    _bump_guild_version(guild_id)
+    return cursor.rowcount
 
+@_pluggable
+async def set_series_duration(guild_id: int, series_id: str, duration: int):
+    async with _connect() as db:
+        cursor = await db.execute(
+            "UPDATE events SET duration = ? WHERE guild_id = ? AND series_id = ?", (duration, guild_id, series_id)
+        )
+        await db.commit()
+    _bump_guild_version(guild_id)
+    return cursor.rowcount
+
+@_pluggable
 async def get_all_events(guild_id: int = None):
-    async with aiosqlite.connect(DB_NAME) as db:
+    async with _connect() as db:
         db.row_factory = aiosqlite.Row
         if guild_id:
             query = "SELECT * FROM events WHERE guild_id = ? ORDER BY event_time ASC"
@@ -102,37 +500,684 @@ async def get_all_events(guild_id: int = None):
         async with db.execute(query, params) as cursor:
             return await cursor.fetchall()
 
-async def delete_event(event_id: int):
-    async with aiosqlite.connect(DB_NAME) as db:
+@_pluggable
+async def get_event(event_id: int, guild_id: int):
+    """Returns the event if it belongs to the guild, else None."""
+    async with _connect() as db:
+        db.row_factory = aiosqlite.Row
+        async with db.execute("SELECT * FROM events WHERE id = ? AND guild_id = ?", (event_id, guild_id)) as cursor:
+            return await cursor.fetchone()
+
+@_pluggable
+async def get_event_index(guild_id: int):
+    """Returns (id, name, event_time) for every event in the guild, in time order. Feeds the event_id autocomplete."""
+    async with _connect() as db:
+        async with db.execute(
+            "SELECT id, name, event_time FROM events WHERE guild_id = ? ORDER BY event_time ASC", (guild_id,)
+        ) as cursor:
+            return await cursor.fetchall()
+
+@_pluggable
+async def get_event_conflicts(guild_id: int, event_ids=(), series_id: str = None):
+    """
+    Reads the maintained conflict pairs for the given events and/or every occurrence of a series.
+    Returns {event_id: [(other_id, other_name, other_event_time), ...]}, only for events that have conflicts.
+    """
+    event_ids = list(event_ids)
+    if not event_ids and series_id is None:
+        return {}
+    placeholders = ",".join("?" * len(event_ids))
+    async with _connect() as db:
+        async with db.execute(f"""
+            SELECT c.event_id, o.id, o.name, o.event_time
+            FROM event_conflicts c
+            JOIN events e ON e.id = c.event_id
+            JOIN events o ON o.id = c.other_id
+            WHERE e.guild_id = ? AND (c.event_id IN ({placeholders}) OR e.series_id = ?)
+            ORDER BY e.event_time ASC, e.id ASC, o.event_time ASC, o.id ASC
+        """, (guild_id, *event_ids, series_id)) as cursor:
+            conflicts = {}
+            async for event_id, other_id, name, event_time in cursor:
+                conflicts.setdefault(event_id, []).append((other_id, name, event_time))
+            return conflicts
+
+@_pluggable
+async def delete_event(event_id: int, guild_id: int = None):
+    """Deletes an event and its reminders. With guild_id, only if the event belongs to that guild. Returns whether it existed."""
+    async with _connect() as db:
+        if guild_id is None:
+            query, params = "SELECT guild_id FROM events WHERE id = ?", (event_id,)
+        else:
+            query, params = "SELECT guild_id FROM events WHERE id = ? AND guild_id = ?", (event_id, guild_id)
+        async with db.execute(query, params) as cursor:
+            row = await cursor.fetchone()
+        if not row:
+            return False
         await db.execute("DELETE FROM events WHERE id = ?", (event_id,))
+        await db.execute("DELETE FROM reminders WHERE event_id = ?", (event_id,))
         await db.commit()
+    _bump_guild_version(row[0])
+    return True
+
+# Set by init_db once the FTS5 index exists
+_fts_enabled = False
+
+# Trigram tokens need at least 3 characters; shorter terms (e.g. 熊, 護盾) are matched with LIKE
+FTS_MIN_TERM = 3
 
-async def get_upcoming_reminders():
+def _like_escape(term):
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+@_pluggable
+async def search_events(guild_id: int, query: str, limit: int = 10):
     """
-    Returns events that need reminders.
+    Events in the guild whose name or description contains every term of the query.
+    Ranked by relevance (name matches weigh more), then by time. Returns Rows with a `snippet` column.
     """
-    now = datetime.datetime.now()
-    async with aiosqlite.connect(DB_NAME) as db:
+    terms = query.split()
+    if not terms:
+        return []
+    fts_terms = [t for t in terms if len(t) >= FTS_MIN_TERM] if _fts_enabled else []
+    like_terms = [t for t in terms if t not in fts_terms]
+
+    like_sql = "".join(" AND (e.name LIKE ? ESCAPE '\\' OR e.description LIKE ? ESCAPE '\\')" for _ in like_terms)
+    like_params = [p for t in like_terms for p in (f"%{_like_escape(t)}%",) * 2]
+
+    async with _connect() as db:
         db.row_factory = aiosqlite.Row
-        # Fetch all future events that haven't had both reminders sent
-        async with db.execute(
-            "SELECT * FROM events WHERE event_time > ? AND (reminder_30_sent = 0 OR reminder_5_sent = 0)",
-            (now,)
-        ) as cursor:
+        if fts_terms:
+            # Each term quoted so user input is never parsed as FTS syntax; implicit AND between them
+            match = " ".join('"' + t.replace('"', '""') + '"' for t in fts_terms)
+            sql = f"""
+                SELECT e.*, snippet(events_fts, -1, '**', '**', '…', 12) AS snippet
+                FROM events_fts
+                JOIN events e ON e.id = events_fts.rowid
+                WHERE events_fts MATCH ? AND e.guild_id = ?{like_sql}
+                ORDER BY bm25(events_fts, 10.0, 1.0), e.event_time
+                LIMIT ?
+            """
+            params = [match, guild_id, *like_params, limit]
+        else:
+            # Short terms only: scan the guild's rows through idx_events_guild_time, in time order
+            sql = f"""
+                SELECT e.*, NULL AS snippet FROM events e
+                WHERE e.guild_id = ?{like_sql}
+                ORDER BY e.event_time
+                LIMIT ?
+            """
+            params = [guild_id, *like_params, limit]
+        async with db.execute(sql, params) as cursor:
+            return await cursor.fetchall()
+
+# Column order matches ReminderRecord
+_DUE_REMINDERS_QUERY = """
+    SELECT r.id, r.offset_minutes, r.fire_at, e.id, e.guild_id, e.event_time, e.event_type, e.name
+    FROM reminders r
+    JOIN events e ON e.id = r.event_id
+    WHERE r.sent = 0 AND r.fire_at <= ? {started_filter}
+      AND NOT EXISTS (
+          SELECT 1 FROM reminders r2
+          WHERE r2.event_id = r.event_id AND r2.offset_minutes < r.offset_minutes AND r2.fire_at <= ?
+      )
+    ORDER BY r.fire_at ASC
+"""
+
+@_pluggable
+async def get_upcoming_reminders(now=None):
+    """
+    Returns reminders that are due right now as ReminderRecords.
+    When several tiers of one event are due (e.g. created late), only the smallest offset is returned.
+    """
+    # Stored times are naive UTC
+    now = now or datetime.datetime.utcnow()
+    async with _connect() as db:
+        db.row_factory = _reminder_factory
+        # Single range scan on idx_reminders_due, regardless of how many tiers are configured
+        query = _DUE_REMINDERS_QUERY.format(started_filter="AND e.event_time > ?")
+        async with db.execute(query, (now, now, now)) as cursor:
             return await cursor.fetchall()
 
-async def mark_reminder_sent(event_id: int, reminder_type: str):
-    async with aiosqlite.connect(DB_NAME) as db:
-        if reminder_type == "30":
-            await db.execute("UPDATE events SET reminder_30_sent = 1 WHERE id = ?", (event_id,))
-        elif reminder_type == "5":
-            await db.execute("UPDATE events SET reminder_5_sent = 1 WHERE id = ?", (event_id,))
+@_pluggable
+async def get_missed_reminders(now=None):
+    """
+    Like get_upcoming_reminders, but also returns unsent reminders whose event has already started.
+    Used after downtime to deliver or summarize what the bot missed.
+    """
+    now = now or datetime.datetime.utcnow()
+    async with _connect() as db:
+        db.row_factory = _reminder_factory
+        query = _DUE_REMINDERS_QUERY.format(started_filter="")
+        async with db.execute(query, (now, now)) as cursor:
+            return await cursor.fetchall()
+
+@_pluggable
+async def get_next_due_at(now=None):
+    """
+    When the scheduler next has work: the earliest unsent reminder of an event that hasn't started,
+    or the earliest pending outbox retry. Returns a naive UTC datetime, or None if nothing is pending.
+    """
+    now = now or datetime.datetime.utcnow()
+    async with _connect() as db:
+        # Walks idx_reminders_due in fire_at order and stops at the first live event
+        async with db.execute("""
+            SELECT r.fire_at FROM reminders r JOIN events e ON e.id = r.event_id
+            WHERE r.sent = 0 AND e.event_time > ?
+            ORDER BY r.fire_at LIMIT 1
+        """, (now,)) as cursor:
+            reminder = await cursor.fetchone()
+        async with db.execute("SELECT MIN(next_attempt_at) FROM outbox WHERE status = 'pending'") as cursor:
+            (retry,) = await cursor.fetchone()
+    candidates = [parse_event_time(t) for t in (reminder and reminder[0], retry) if t]
+    return min(candidates) if candidates else None
+
+@_pluggable
+async def mark_reminder_sent(reminder_id: int):
+    """Marks a reminder as sent, along with any larger-offset tiers of the same event it supersedes."""
+    async with _connect() as db:
+        await db.execute("""
+            UPDATE reminders SET sent = 1
+            WHERE sent = 0
+              AND event_id = (SELECT event_id FROM reminders WHERE id = ?)
+              AND offset_minutes >= (SELECT offset_minutes FROM reminders WHERE id = ?)
+        """, (reminder_id, reminder_id))
         await db.commit()
 
-async def delete_old_events():
-    """Deletes events that are more than 1 hour past their start time."""
+@_pluggable
+async def enqueue_due_reminders(now=None):
+    """
+    Moves every due reminder into the outbox in one transaction.
+    The reminder rows (and any tiers they supersede) are marked sent in the same transaction,
+    so a crash can never leave a reminder both queued and still due. Returns the number of outbox rows inserted.
+    """
+    now = now or datetime.datetime.utcnow()
+    query = _DUE_REMINDERS_QUERY.format(started_filter="AND e.event_time > ?")
+    async with _connect() as db:
+        db.row_factory = _reminder_factory
+        async with db.execute(query, (now, now, now)) as cursor:
+            due = await cursor.fetchall()
+        if not due:
+            return 0
+
+        cursor = await db.executemany("""
+            INSERT OR IGNORE INTO outbox (dedupe_key, reminder_id, event_id, guild_id, next_attempt_at, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (f"{r.event_id}:{r.offset_minutes}:{r.fire_at}", r.reminder_id, r.event_id, r.guild_id, now, now)
+            for r in due
+        ])
+        queued = cursor.rowcount
+        # Only the events selected above: a reminder committed by another connection since the SELECT
+        # is left for the next tick instead of being marked sent unqueued. Superseded tiers go with them.
+        await db.executemany(
+            "UPDATE reminders SET sent = 1 WHERE sent = 0 AND fire_at <= ? AND event_id = ?",
+            [(now, event_id) for event_id in {r.event_id for r in due}]
+        )
+        await db.commit()
+    return queued
+
+@_pluggable
+async def fetch_outbox_batch(limit: int = 50, now=None):
+    """
+    Returns pending outbox entries whose next attempt is due, as ReminderRecords with outbox_id set.
+    event_time/name are None if the event was deleted after it was queued.
+    """
+    now = now or datetime.datetime.utcnow()
+    async with _connect() as db:
+        db.row_factory = _reminder_factory
+        async with db.execute("""
+            SELECT o.reminder_id, r.offset_minutes, r.fire_at, o.event_id, o.guild_id,
+                   e.event_time, e.event_type, e.name, o.id, o.attempts
+            FROM outbox o
+            LEFT JOIN events e ON e.id = o.event_id
+            LEFT JOIN reminders r ON r.id = o.reminder_id
+            WHERE o.status = 'pending' AND o.next_attempt_at <= ?
+            ORDER BY o.next_attempt_at ASC
+            LIMIT ?
+        """, (now, limit)) as cursor:
+            return await cursor.fetchall()
+
+@_pluggable
+async def get_event_descriptions(event_ids):
+    """Returns {event_id: description} for the given events (the text columns left out of ReminderRecord)."""
+    if not event_ids:
+        return {}
+    placeholders = ",".join("?" * len(event_ids))
+    async with _connect() as db:
+        async with db.execute(f"SELECT id, description FROM events WHERE id IN ({placeholders})", list(event_ids)) as cursor:
+            return {event_id: description for event_id, description in await cursor.fetchall()}
+
+@_pluggable
+async def ack_outbox(outbox_ids, now=None):
+    """Acknowledges delivered outbox entries by id."""
+    if not outbox_ids:
+        return
+    now = now or datetime.datetime.utcnow()
+    async with _connect() as db:
+        await db.executemany(
+            "UPDATE outbox SET status = 'sent', sent_at = ? WHERE id = ?",
+            [(now, outbox_id) for outbox_id in outbox_ids]
+        )
+        await db.commit()
+
+@_pluggable
+async def retry_outbox(outbox_id: int, error: str, delay_seconds: float, max_attempts: int = 5, now=None):
+    """Records a failed delivery and schedules the next attempt, or gives up after max_attempts."""
+    next_attempt = (now or datetime.datetime.utcnow()) + datetime.timedelta(seconds=delay_seconds)
+    async with _connect() as db:
+        await db.execute("""
+            UPDATE outbox
+            SET attempts = attempts + 1,
+                last_error = ?,
+                next_attempt_at = ?,
+                status = CASE WHEN attempts + 1 >= ? THEN 'dead' ELSE 'pending' END
+            WHERE id = ?
+        """, (error[:500], next_attempt, max_attempts, outbox_id))
+        await db.commit()
+
+# Events stay in the hot table until this long after their start, then move to events_archive
+ARCHIVE_AFTER = datetime.timedelta(hours=1)
+ARCHIVE_BATCH_SIZE = 500
+ARCHIVE_FIELDS = ("id", "guild_id", "name", "event_time", "description", "event_type", "coordinates",
+                  "repeat_config", "icon_url", "color_hex", "duration", "series_id")
+
+@_pluggable
+async def archive_old_events(now=None, batch_size: int = ARCHIVE_BATCH_SIZE):
+    """
+    Moves events more than ARCHIVE_AFTER past their start from events into events_archive,
+    batch_size events per transaction so a large backlog never holds the write lock for long.
+    Returns how many events were moved.
+    """
     # Use naive UTC to match SQLite default string format
-    cutoff = datetime.datetime.utcnow() - datetime.timedelta(hours=1)
-    async with aiosqlite.connect(DB_NAME) as db:
-        await db.execute("DELETE FROM events WHERE event_time < ?", (cutoff,))
+    now = now or datetime.datetime.utcnow()
+    cutoff = now - ARCHIVE_AFTER
+    columns = ", ".join(ARCHIVE_FIELDS)
+    moved = 0
+    guild_ids = set()
+    async with _connect() as db:
+        while True:
+            async with db.execute("SELECT id, guild_id FROM events WHERE event_time < ? LIMIT ?", (cutoff, batch_size)) as cursor:
+                batch = await cursor.fetchall()
+            if not batch:
+                break
+            ids = [row[0] for row in batch]
+            placeholders = ",".join("?" * len(ids))
+            await db.execute(f"""
+                INSERT INTO events_archive (month, {columns}, archived_at)
+                SELECT substr(event_time, 1, 7), {columns}, ? FROM events WHERE id IN ({placeholders})
+            """, (now, *ids))
+            await db.execute(f"DELETE FROM reminders WHERE event_id IN ({placeholders})", ids)
+            await db.execute(f"DELETE FROM events WHERE id IN ({placeholders})", ids)
+            await db.commit()
+            moved += len(ids)
+            guild_ids.update(row[1] for row in batch)
+            if len(ids) < batch_size:
+                break
+
+        # Delivered or dead outbox entries are only kept while their event is live
+        await db.execute("DELETE FROM outbox WHERE status != 'pending' AND event_id NOT IN (SELECT id FROM events)")
         await db.commit()
+    for guild_id in guild_ids:
+        _bump_guild_version(guild_id)
+    return moved
+
+def archive_months(start, end):
+    """The 'YYYY-MM' partitions that can hold events with start <= event_time < end."""
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+@_pluggable
+async def get_event_history(guild_id: int, start, end, limit: Optional[int] = None):
+    """Archived events of a guild with start <= event_time < end, oldest first. Only the months in range are read."""
+    months = archive_months(start, end)
+    placeholders = ",".join("?" * len(months))
+    async with _connect() as db:
+        db.row_factory = aiosqlite.Row
+        async with db.execute(f"""
+            SELECT * FROM events_archive
+            WHERE month IN ({placeholders}) AND guild_id = ? AND event_time >= ? AND event_time < ?
+            ORDER BY event_time ASC, id ASC
+            LIMIT ?
+        """, (*months, guild_id, start, end, -1 if limit is None else limit)) as cursor:
+            return await cursor.fetchall()
+
+class _BackupRestarting(Exception):
+    pass
+
+@_pluggable
+async def backup(target_path: str, pages: int = 256, sleep: float = 0.01, max_restarts: int = 3):
+    """
+    Copies the live database into target_path with SQLite's online backup API, `pages` pages per step.
+    The copy runs on the connection's worker thread and releases the source between steps, so the event loop
+    and other writers keep going. A write from another connection restarts the copy; if that keeps happening,
+    the rest is done in a single step, which holds a read lock for the (short) length of one full copy.
+    """
+    restarts = 0
+    last_remaining = None
+
+    def progress(status, remaining, total):
+        nonlocal restarts, last_remaining
+        if last_remaining is not None and remaining > last_remaining:
+            restarts += 1
+            if restarts > max_restarts:
+                raise _BackupRestarting()
+        last_remaining = remaining
+
+    target = sqlite3.connect(target_path, check_same_thread=False)
+    try:
+        async with _connect() as db:
+            try:
+                await db.backup(target, pages=pages, sleep=sleep, progress=progress)
+            except _BackupRestarting:
+                logger.warning("Backup restarted %d times under write load, finishing it in one step", restarts)
+                await db.backup(target, pages=-1, sleep=sleep)
+    finally:
+        target.close()
+
+# --- Bulk import / export -------------------------------------------------
+# Writers stream rows from a cursor straight into a text file object; readers yield one dict per event.
+
+EXPORT_FIELDS = ("name", "event_time", "duration", "description", "repeat_config")
+IMPORT_CHUNK_SIZE = 500
+REPEAT_OPTIONS = {None, "1d", "2d", "7d", "14d", "4h", "8h"}
+
+@_pluggable
+async def iter_events(guild_id: int):
+    """Yields a guild's events in time order one row at a time, without materialising the result set."""
+    async with _connect() as db:
+        db.row_factory = aiosqlite.Row
+        async with db.execute(
+            "SELECT * FROM events WHERE guild_id = ? ORDER BY event_time ASC", (guild_id,)
+        ) as cursor:
+            async for row in cursor:
+                yield row
+
+def _ics_escape(text):
+    return (text or "").replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def _ics_unescape(text):
+    return text.replace("\\n", "\n").replace("\\N", "\n").replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\")
+
+def _ics_fold(line):
+    # RFC 5545: lines longer than 75 octets continue on the next line after a single space
+    out = []
+    while len(line.encode("utf-8")) > 75:
+        cut = 75
+        while len(line[:cut].encode("utf-8")) > 75:
+            cut -= 1
+        out.append(line[:cut])
+        line = " " + line[cut:]
+    out.append(line)
+    return "\r\n".join(out)
+
+def ics_event_lines(event, stamp, uid_prefix="event"):
+    """VEVENT lines for one event row (shared by /export and the calendar feed). `stamp` is when the file was generated."""
+    start = parse_event_time(event['event_time'])
+    end = start + datetime.timedelta(minutes=event['duration'] or 0)
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid_prefix}-{event['id']}@dc-ks-assistant",
+        f"DTSTAMP:{stamp:%Y%m%dT%H%M%SZ}",
+        f"DTSTART:{start:%Y%m%dT%H%M%SZ}",
+        f"DTEND:{end:%Y%m%dT%H%M%SZ}",
+        f"SUMMARY:{_ics_escape(event['name'])}",
+    ]
+    if event['description']:
+        lines.append(f"DESCRIPTION:{_ics_escape(event['description'])}")
+    lines.append("END:VEVENT")
+    return [_ics_fold(line) for line in lines]
+
+def _export_record(event):
+    record = {field: event[field] for field in EXPORT_FIELDS}
+    record["event_time"] = parse_event_time(event['event_time']).strftime("%Y-%m-%d %H:%M")
+    return record
+
+async def export_events(guild_id: int, fp, fmt: str = "csv"):
+    """Streams a guild's events into the text file `fp` as csv, json or ics. Returns the number written."""
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(fp, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        async for event in iter_events(guild_id):
+            writer.writerow(_export_record(event))
+            count += 1
+    elif fmt == "json":
+        fp.write("[")
+        async for event in iter_events(guild_id):
+            fp.write(("," if count else "") + "\n  " + json.dumps(_export_record(event), ensure_ascii=False))
+            count += 1
+        fp.write("\n]\n")
+    elif fmt == "ics":
+        stamp = datetime.datetime.utcnow()
+        fp.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//DC KS Assistant//Schedule//EN\r\n")
+        async for event in iter_events(guild_id):
+            fp.write("\r\n".join(ics_event_lines(event, stamp)) + "\r\n")
+            count += 1
+        fp.write("END:VCALENDAR\r\n")
+    else:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    return count
+
+def _iter_json_array(fp, chunk_size=65536):
+    """Incrementally decodes a top-level JSON array (or JSON Lines) without loading the whole file."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    eof = False
+    started = False
+    while True:
+        buffer = buffer.lstrip()
+        if started:
+            buffer = buffer.lstrip(",").lstrip()
+        elif buffer.startswith("["):
+            buffer = buffer[1:]
+            started = True
+            continue
+        if buffer.startswith("]"):
+            return
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                if buffer.strip():
+                    raise
+                return
+            chunk = fp.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        yield item
+        buffer = buffer[end:]
+
+def _unfold_ics(fp):
+    """Joins RFC 5545 continuation lines back into logical lines."""
+    current = None
+    for raw in fp:
+        line = raw.rstrip("\r\n")
+        if line.startswith((" ", "\t")) and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+def _ics_param(param):
+    name, _, value = param.partition("=")
+    return name.upper(), value.strip('"')
+
+def _ics_datetime(prop):
+    """
+    A DTSTART/DTEND (params, value) pair as naive UTC. UTC ("Z") and floating times are taken as UTC like the
+    rest of the bot; TZID times are converted. All-day dates have no start time and are rejected.
+    """
+    params, value = prop
+    if params.get("VALUE", "").upper() == "DATE" or "T" not in value:
+        raise ValueError(f"all-day event ({value}) has no start time")
+    parsed = datetime.datetime.strptime(value.rstrip("Z")[:15], "%Y%m%dT%H%M%S")
+    tzid = params.get("TZID")
+    if tzid and not value.endswith("Z"):
+        try:
+            zone = zoneinfo.ZoneInfo(tzid)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"unknown time zone {tzid!r}")
+        parsed = parsed.replace(tzinfo=zone).astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def _iter_ics(fp):
+    event = None
+    for line in _unfold_ics(fp):
+        key, _, value = line.partition(":")
+        key, *params = key.split(";")
+        key = key.upper()
+        if key == "BEGIN" and value.upper() == "VEVENT":
+            event = {}
+        elif event is None:
+            continue
+        elif key == "END" and value.upper() == "VEVENT":
+            yield event
+            event = None
+        elif key == "SUMMARY":
+            event["name"] = _ics_unescape(value)
+        elif key == "DESCRIPTION":
+            event["description"] = _ics_unescape(value)
+        elif key in ("DTSTART", "DTEND"):
+            # Kept raw and converted in validate_import_row, so a bad time is an error for this row only
+            event[key.lower()] = (dict(_ics_param(p) for p in params), value.strip())
+
+def iter_import_rows(fp, fmt: str):
+    """Yields raw event dicts from a csv, json or ics text file."""
+    if fmt == "csv":
+        yield from csv.DictReader(fp)
+    elif fmt == "json":
+        yield from _iter_json_array(fp)
+    elif fmt == "ics":
+        yield from _iter_ics(fp)
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+def validate_import_row(row):
+    """Normalises one imported row against EventConfig. Returns a dict or raises ValueError."""
+    name = (row.get("name") or "").strip()
+    name = EventConfig.get_legacy_mapping().get(name, name)
+    if name not in EventConfig.EVENTS:
+        raise ValueError(f"unknown event name {name!r}")
+
+    event_time = row.get("event_time")
+    if "dtstart" in row:
+        # ICS row: times still carry their parameters
+        event_time = _ics_datetime(row["dtstart"])
+        if "dtend" in row:
+            row = {**row, "duration": int((_ics_datetime(row["dtend"]) - event_time).total_seconds() // 60)}
+    if not event_time:
+        raise ValueError("missing event_time")
+    event_time = parse_event_time(event_time.strip() if isinstance(event_time, str) else event_time)
+
+    duration = row.get("duration")
+    duration = int(duration) if duration not in (None, "") else EventConfig.get_event_duration(name)
+    if duration < 0:
+        raise ValueError("negative duration")
+    if duration > MAX_EVENT_DURATION:
+        raise ValueError(f"duration over {MAX_EVENT_DURATION} minutes")
+
+    repeat_config = row.get("repeat_config") or None
+    if repeat_config == "None":
+        repeat_config = None
+    if repeat_config not in REPEAT_OPTIONS:
+        raise ValueError(f"unknown repeat_config {repeat_config!r}")
+
+    return {
+        "name": name,
+        "event_time": event_time.replace(second=0, microsecond=0),
+        "duration": duration,
+        "description": (row.get("description") or "")[:1000],
+        "repeat_config": repeat_config,
+    }
+
+@_pluggable
+async def import_events(guild_id: int, rows, chunk_size: int = IMPORT_CHUNK_SIZE):
+    """
+    Validates and inserts events in chunks, one transaction per chunk (executemany for events and reminders).
+    Rows duplicating an existing (name, event_time) in the guild, or an earlier row of the same import, are skipped.
+    Returns {"imported", "duplicates", "errors"} where errors holds the first few "row N: reason" strings.
+    """
+    stats = {"imported": 0, "duplicates": 0, "errors": []}
+    error_count = 0
+    seen = set()
+    rows = iter(rows)
+    row_number = 0
+
+    async with _connect() as db:
+        while True:
+            chunk = []
+            for raw in rows:
+                row_number += 1
+                try:
+                    event = validate_import_row(raw)
+                except (ValueError, TypeError, AttributeError) as e:
+                    error_count += 1
+                    if len(stats["errors"]) < 10:
+                        stats["errors"].append(f"row {row_number}: {e}")
+                    continue
+                key = (event["name"], event["event_time"])
+                if key in seen:
+                    stats["duplicates"] += 1
+                    continue
+                seen.add(key)
+                chunk.append(event)
+                if len(chunk) >= chunk_size:
+                    break
+            if not chunk:
+                break
+
+            # Dedupe against the DB with one indexed range scan per chunk
+            lo = min(e["event_time"] for e in chunk)
+            hi = max(e["event_time"] for e in chunk)
+            async with db.execute(
+                "SELECT name, event_time FROM events WHERE guild_id = ? AND event_time BETWEEN ? AND ?",
+                (guild_id, lo, hi + datetime.timedelta(seconds=59))
+            ) as cursor:
+                existing = {(name, parse_event_time(t).replace(second=0, microsecond=0)) async for name, t in cursor}
+            fresh = [e for e in chunk if (e["name"], e["event_time"]) not in existing]
+            stats["duplicates"] += len(chunk) - len(fresh)
+            if not fresh:
+                continue
+
+            async with db.execute("SELECT COALESCE(MAX(id), 0) FROM events") as cursor:
+                (last_id,) = await cursor.fetchone()
+
+            rows_to_insert = []
+            for e in fresh:
+                color, icon = EventConfig.get_event_metadata(e["name"])
+                rows_to_insert.append((
+                    guild_id, e["name"], e["event_time"], e["description"], e["name"],
+                    e["repeat_config"], icon, color, e["duration"]
+                ))
+            await db.executemany("""
+                INSERT INTO events (guild_id, name, event_time, description, event_type, repeat_config, icon_url, color_hex, duration)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows_to_insert)
+
+            async with db.execute(
+                "SELECT id, name, event_time FROM events WHERE guild_id = ? AND id > ?", (guild_id, last_id)
+            ) as cursor:
+                inserted = await cursor.fetchall()
+            await db.executemany(
+                "INSERT OR IGNORE INTO reminders (event_id, offset_minutes, fire_at) VALUES (?, ?, ?)",
+                [
+                    (event_id, offset, parse_event_time(event_time) - datetime.timedelta(minutes=offset))
+                    for event_id, name, event_time in inserted
+                    for offset in EventConfig.get_reminder_offsets(name)
+                ]
+            )
+            await db.commit()
+            stats["imported"] += len(fresh)
+
+    if error_count > len(stats["errors"]):
+        stats["errors"].append(f"... and {error_count - len(stats['errors'])} more")
+    if stats["imported"]:
+        _bump_guild_version(guild_id)
+    return stats
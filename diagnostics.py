@@ -0,0 +1,157 @@
+import asyncio
+import collections
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Environment knobs:
+#   LOOP_DEBUG          "1" enables asyncio debug mode (slow callback warnings, never-awaited coroutine tracking)
+#   SLOW_CALLBACK_MS    a single callback/step running longer than this is logged by asyncio (default 100)
+#   LOOP_LAG_INTERVAL   heartbeat period in seconds (default 1.0)
+#   LOOP_LAG_WARN_MS    heartbeat lateness that gets logged as a stall (default 250)
+
+class LoopMonitor:
+    """
+    Heartbeat task that measures event-loop lag: how late a sleep(interval) wakes up.
+    Anything blocking the loop (sync file I/O, a slow SQLite commit on the loop thread, heavy CPU work)
+    shows up here as lag.
+    """
+    def __init__(self, interval=1.0, warn_after=0.25):
+        self.interval = interval
+        self.warn_after = warn_after
+        self.samples = 0
+        self.stalls = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.avg_lag = 0.0
+        self._task = None
+
+    def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+
+            self.samples += 1
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            # Exponential moving average, roughly the last 20 heartbeats
+            self.avg_lag += (lag - self.avg_lag) / min(self.samples, 20)
+
+            if lag >= self.warn_after:
+                self.stalls += 1
+                logger.warning("🐢 Event loop stalled for %.0fms", lag * 1000)
+
+    def stats(self):
+        return {
+            "samples": self.samples,
+            "stalls": self.stalls,
+            "last_lag_ms": round(self.last_lag * 1000, 1),
+            "avg_lag_ms": round(self.avg_lag * 1000, 1),
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+        }
+
+def start():
+    """Configures asyncio debug mode from the environment and starts the heartbeat. Needs a running loop."""
+    loop = asyncio.get_running_loop()
+    if os.getenv("LOOP_DEBUG", "0") == "1":
+        loop.set_debug(True)
+        loop.slow_callback_duration = int(os.getenv("SLOW_CALLBACK_MS", "100")) / 1000
+        # asyncio reports slow callbacks as warnings on its own logger
+        logging.getLogger("asyncio").setLevel(logging.WARNING)
+        logger.info("asyncio debug mode on (slow callback threshold %.0fms)", loop.slow_callback_duration * 1000)
+
+    monitor = LoopMonitor(
+        interval=float(os.getenv("LOOP_LAG_INTERVAL", "1.0")),
+        warn_after=int(os.getenv("LOOP_LAG_WARN_MS", "250")) / 1000,
+    )
+    return monitor.start()
+
+# Only one profile can run at a time (cProfile refuses to nest)
+_profile_lock = asyncio.Lock()
+
+def profile_running():
+    return _profile_lock.locked()
+
+async def profile_cprofile(seconds, top=40):
+    """
+    Deterministic profile of everything the event loop thread runs during the next `seconds`.
+    Returns a pstats report of the top functions by internal time.
+    """
+    async with _profile_lock:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.disable()
+
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+    return out.getvalue()
+
+async def profile_sampling(seconds, interval=0.005, top=40):
+    """
+    Low-overhead statistical profile: a helper thread samples the loop thread's stack every `interval` seconds.
+    Returns the top functions by self samples (on top of the stack) and by total samples (anywhere on it).
+    """
+    target = threading.get_ident()
+    self_counts = collections.Counter()
+    total_counts = collections.Counter()
+    taken = 0
+    done = threading.Event()
+
+    def sampler():
+        nonlocal taken
+        while not done.wait(interval):
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                continue
+            taken += 1
+            self_counts[_frame_key(frame)] += 1
+            seen = set()
+            while frame is not None:
+                key = _frame_key(frame)
+                if key not in seen:
+                    seen.add(key)
+                    total_counts[key] += 1
+                frame = frame.f_back
+
+    async with _profile_lock:
+        thread = threading.Thread(target=sampler, name="profile-sampler", daemon=True)
+        thread.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            done.set()
+            await asyncio.to_thread(thread.join)
+
+    lines = [f"Sampling profile: {taken} samples over {seconds}s (every {interval * 1000:.0f}ms)", ""]
+    for title, counts in (("Top by self samples", self_counts), ("Top by total samples", total_counts)):
+        lines.append(title)
+        for key, count in counts.most_common(top):
+            lines.append(f"{count:8d} {count / max(taken, 1) * 100:6.1f}%  {key}")
+        lines.append("")
+    return "\n".join(lines)
+
+def _frame_key(frame):
+    code = frame.f_code
+    return f"{code.co_filename}:{code.co_firstlineno}({code.co_name})"
@@ -0,0 +1,105 @@
+import asyncio
+import email.utils
+import io
+import logging
+import os
+import uuid
+from aiohttp import web
+import database
+
+logger = logging.getLogger(__name__)
+
+# Environment knobs:
+#   FEED_SERVER   "1" starts the read-only calendar feed server (default off)
+#   FEED_HOST     bind address (default 127.0.0.1, local only)
+#   FEED_PORT     port (default 8080)
+#
+# Routes:
+#   GET /guilds/<guild_id>/events.ics
+#   GET /guilds/<guild_id>/events.json
+
+CONTENT_TYPES = {
+    "ics": "text/calendar; charset=utf-8",
+    "json": "application/json; charset=utf-8",
+}
+
+class FeedServer:
+    """
+    Serves each guild's schedule as ICS/JSON. Rendered bodies are cached per (guild, format) and keyed
+    by the guild's change counter, so polling clients get 304s and the DB is only read after a write.
+    """
+    def __init__(self, host="127.0.0.1", port=8080):
+        self.host = host
+        self.port = port
+        # Changes on every restart, since the per-guild counters start over
+        self.boot_id = uuid.uuid4().hex[:8]
+        self._cache = {} # (guild_id, fmt) -> (version, etag, last_modified, body)
+        self._locks = {}
+        self._runner = None
+
+        self.app = web.Application()
+        self.app.router.add_get(r"/guilds/{guild_id:\d+}/events.{fmt:(ics|json)}", self.handle_feed)
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info("📅 Calendar feeds on http://%s:%d/guilds/<guild_id>/events.ics", self.host, self.port)
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def render(self, guild_id, fmt):
+        key = (guild_id, fmt)
+        version = database.get_guild_version(guild_id)
+        cached = self._cache.get(key)
+        if cached and cached[0] == version:
+            return cached
+
+        # One render per (guild, format) at a time; waiters pick up the fresh entry
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] == database.get_guild_version(guild_id):
+                return cached
+
+            version = database.get_guild_version(guild_id)
+            last_modified = database.get_guild_last_modified(guild_id)
+            buf = io.StringIO()
+            await database.export_events(guild_id, buf, fmt)
+            etag = f'"{self.boot_id}-{guild_id}-{version}"'
+            entry = (version, etag, last_modified, buf.getvalue().encode("utf-8"))
+            # Don't cache a body that raced with a write
+            if database.get_guild_version(guild_id) == version:
+                self._cache[key] = entry
+            return entry
+
+    async def handle_feed(self, request):
+        guild_id = int(request.match_info["guild_id"])
+        fmt = request.match_info["fmt"]
+        _, etag, last_modified, body = await self.render(guild_id, fmt)
+
+        headers = {
+            "ETag": etag,
+            "Last-Modified": email.utils.format_datetime(last_modified, usegmt=True),
+            "Cache-Control": "max-age=60",
+        }
+
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+                return web.Response(status=304, headers=headers)
+        elif request.if_modified_since and last_modified <= request.if_modified_since:
+            return web.Response(status=304, headers=headers)
+
+        return web.Response(body=body, headers={**headers, "Content-Type": CONTENT_TYPES[fmt]})
+
+async def start_from_env():
+    """Starts the feed server if FEED_SERVER=1. Returns the server (to stop later) or None."""
+    if os.getenv("FEED_SERVER", "0") != "1":
+        return None
+    server = FeedServer(os.getenv("FEED_HOST", "127.0.0.1"), int(os.getenv("FEED_PORT", "8080")))
+    await server.start()
+    return server
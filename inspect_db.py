@@ -0,0 +1,236 @@
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sqlite3
+import sys
+
+import database
+from cogs.scheduler import plan_interval
+
+# Read-only diagnostics for a scheduler database. Rows are streamed from the cursor, so it is safe to point
+# at a large production DB, and "due" means exactly what the scheduler would do: the same query
+# (database._DUE_REMINDERS_QUERY) and the same tick planner (plan_interval).
+# Usage:
+#   python inspect_db.py stats
+#   python inspect_db.py reminders --due --guild 123
+#   python inspect_db.py events --since 2025-10-01 --until 2025-10-08 --json
+#   python inspect_db.py --db backup.db --now "2025-10-20 13:50" reminders --guild 123
+
+def parse_time(value):
+    try:
+        return database.parse_event_time(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def connect(path):
+    if not os.path.exists(path):
+        sys.exit(f"No database at {path}")
+    # Read-only, so inspecting never migrates or locks the live bot out
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    db.row_factory = sqlite3.Row
+    return db
+
+class Output:
+    """Text lines, or JSON Lines with --json (one object per row, printed as it is read)."""
+    def __init__(self, as_json):
+        self.as_json = as_json
+
+    def row(self, record, text):
+        print(json.dumps(record, ensure_ascii=False, default=str) if self.as_json else text)
+
+    def summary(self, count, noun):
+        if not self.as_json:
+            print(f"-- {count} {noun}")
+
+def filters(args, time_column):
+    clauses, params = [], []
+    if args.guild is not None:
+        clauses.append("e.guild_id = ?")
+        params.append(args.guild)
+    if args.since:
+        clauses.append(f"{time_column} >= ?")
+        params.append(args.since)
+    if args.until:
+        clauses.append(f"{time_column} < ?")
+        params.append(args.until)
+    return "".join(f" AND {c}" for c in clauses), params
+
+def due_ids(db, now, include_started):
+    """Reminder ids the scheduler's own query selects at `now` (a handful, so kept as a set)."""
+    if include_started:
+        query, params = database._DUE_REMINDERS_QUERY.format(started_filter=""), (now, now)
+    else:
+        query, params = database._DUE_REMINDERS_QUERY.format(started_filter="AND e.event_time > ?"), (now, now, now)
+    return {row[0] for row in db.execute(query, params)}
+
+def cmd_events(db, args, out):
+    where, params = filters(args, "e.event_time")
+    if args.expired:
+        where += " AND e.event_time < ?"
+        params.append(args.now - database.ARCHIVE_AFTER)
+    count = 0
+    for e in db.execute(f"""
+        SELECT e.id, e.guild_id, e.name, e.event_time, e.end_time, e.duration, e.repeat_config, e.series_id,
+               EXISTS (SELECT 1 FROM event_conflicts c WHERE c.event_id = e.id) AS conflict
+        FROM events e WHERE 1 = 1{where}
+        ORDER BY e.event_time, e.id
+        LIMIT ?
+    """, (*params, args.limit)):
+        count += 1
+        flags = " ⚠️ conflict" if e["conflict"] else ""
+        series = f" series={e['series_id'][:8]}" if e["series_id"] else ""
+        out.row(dict(e), f"[{e['id']}] guild={e['guild_id']} {e['event_time']} → {e['end_time']} "
+                         f"{e['name']} repeat={e['repeat_config'] or '-'}{series}{flags}")
+    out.summary(count, "event(s)")
+
+def cmd_reminders(db, args, out):
+    due = due_ids(db, args.now, include_started=False)
+    missed = due_ids(db, args.now, include_started=True) - due
+    where, params = filters(args, "r.fire_at")
+    if args.due:
+        where += " AND r.sent = 0 AND r.fire_at <= ?"
+        params.append(args.now)
+
+    count = 0
+    for r in db.execute(f"""
+        SELECT r.id, r.offset_minutes, r.fire_at, r.sent, e.id AS event_id, e.guild_id, e.event_time, e.name
+        FROM reminders r JOIN events e ON e.id = r.event_id
+        WHERE 1 = 1{where}
+        ORDER BY r.fire_at, r.id
+    """, params):
+        if r["sent"]:
+            state = "sent"
+        elif r["id"] in due:
+            state = "due"
+        elif r["id"] in missed:
+            state = "missed" # event already started; catch_up decides after downtime
+        elif r["fire_at"] <= str(args.now):
+            state = "superseded" # a smaller tier of the same event is also due
+        else:
+            state = "waiting"
+        if args.due and state not in ("due", "missed"):
+            continue
+
+        in_minutes = (database.parse_event_time(r["fire_at"]) - args.now).total_seconds() / 60
+        out.row({**dict(r), "state": state, "fires_in_minutes": round(in_minutes, 2)},
+                f"[{r['id']}] {state:<10} {r['fire_at']} ({in_minutes:+.1f}m) T-{r['offset_minutes']}m "
+                f"guild={r['guild_id']} event={r['event_id']} {r['name']} @ {r['event_time']}")
+        count += 1
+        if count >= args.limit:
+            break
+    out.summary(count, "reminder(s)")
+
+def percentile_sql(db, select, where, count, fraction):
+    if not count:
+        return None
+    (value,) = db.execute(f"{select} {where} ORDER BY 1 LIMIT 1 OFFSET ?", (min(count - 1, int(count * fraction)),)).fetchone()
+    return value
+
+def cmd_stats(db, args, out):
+    now = args.now
+    one = lambda sql, *params: db.execute(sql, params).fetchone()[0]
+    stats = {"now": str(now)}
+
+    stats["events"] = {
+        "live": one("SELECT COUNT(*) FROM events"),
+        "awaiting_archive": one("SELECT COUNT(*) FROM events WHERE event_time < ?", now - database.ARCHIVE_AFTER),
+        "archived": one("SELECT COUNT(*) FROM events_archive"),
+        "with_conflicts": one("SELECT COUNT(DISTINCT event_id) FROM event_conflicts"),
+    }
+    due = due_ids(db, now, include_started=False)
+    stats["reminders"] = {
+        "waiting": one("""SELECT COUNT(*) FROM reminders r JOIN events e ON e.id = r.event_id
+                          WHERE r.sent = 0 AND r.fire_at > ? AND e.event_time > ?""", now, now),
+        "due_now": len(due),
+        "missed": len(due_ids(db, now, include_started=True) - due),
+        "sent": one("SELECT COUNT(*) FROM reminders WHERE sent = 1"),
+    }
+    stats["outbox"] = {status: count for status, count in db.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status")}
+
+    # Lag = delivery time minus when the reminder was meant to fire (only reminders of live events remain)
+    lag = "(julianday(o.sent_at) - julianday(r.fire_at)) * 86400"
+    lag_from = f"FROM outbox o JOIN reminders r ON r.id = o.reminder_id WHERE o.status = 'sent' AND o.sent_at IS NOT NULL"
+    delivered, avg_lag, max_lag = db.execute(f"SELECT COUNT(*), AVG({lag}), MAX({lag}) {lag_from}").fetchone()
+    stats["lag_seconds"] = {
+        "delivered": delivered,
+        "avg": avg_lag,
+        "p50": percentile_sql(db, f"SELECT {lag}", lag_from, delivered, 0.50),
+        "p95": percentile_sql(db, f"SELECT {lag}", lag_from, delivered, 0.95),
+        "max": max_lag,
+    }
+
+    # The scheduler's own view: when it would wake next and why
+    next_due = asyncio.run(database.get_next_due_at(now))
+    interval, reason = plan_interval(now, next_due, 0)
+    stats["scheduler"] = {"next_due": next_due and str(next_due), "next_tick_seconds": round(interval, 1), "reason": reason}
+
+    page_size = one("PRAGMA page_size")
+    stats["size_bytes"] = {"total": one("PRAGMA page_count") * page_size, "free": one("PRAGMA freelist_count") * page_size}
+    try:
+        stats["objects"] = [
+            {"name": name, "type": kind or "internal", "bytes": size, "pages": pages}
+            for name, kind, size, pages in db.execute("""
+                SELECT s.name, m.type, SUM(s.pgsize), COUNT(*) FROM dbstat s
+                LEFT JOIN sqlite_master m ON m.name = s.name
+                GROUP BY s.name ORDER BY SUM(s.pgsize) DESC
+            """)
+        ]
+    except sqlite3.OperationalError:
+        stats["objects"] = None # SQLite built without dbstat
+
+    if out.as_json:
+        print(json.dumps(stats, ensure_ascii=False))
+        return
+
+    print(f"As of {now} UTC")
+    for section in ("events", "reminders", "outbox", "lag_seconds", "scheduler", "size_bytes"):
+        values = ", ".join(f"{k}={v:.1f}" if isinstance(v, float) else f"{k}={v}" for k, v in stats[section].items())
+        print(f"{section:<12} {values or '-'}")
+    if stats["objects"]:
+        print("\nTables and indexes:")
+        for obj in stats["objects"]:
+            print(f"  {obj['bytes'] / 1024:>10.0f} KiB  {obj['type']:<8} {obj['name']}")
+
+def cmd_schema(db, args, out):
+    for name, kind, sql in db.execute("SELECT name, type, sql FROM sqlite_master WHERE sql IS NOT NULL ORDER BY type DESC, name"):
+        out.row({"name": name, "type": kind, "sql": sql}, f"-- {kind} {name}\n{sql};\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect a scheduler database without loading it into memory.")
+    parser.add_argument("--db", default=os.getenv("DB_PATH", "scheduler.db"))
+    parser.add_argument("--now", type=parse_time, default=None, help="Evaluate as of this UTC time (default: now)")
+    parser.add_argument("--json", action="store_true", help="JSON Lines output (one object per row)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def with_filters(sub):
+        sub.add_argument("--guild", type=int)
+        sub.add_argument("--since", type=parse_time, help="UTC time, inclusive")
+        sub.add_argument("--until", type=parse_time, help="UTC time, exclusive")
+        sub.add_argument("--limit", type=int, default=1000)
+        return sub
+
+    events = with_filters(commands.add_parser("events", help="List live events (filtered by event time)"))
+    events.add_argument("--expired", action="store_true", help="Only events the next cleanup would archive")
+    reminders = with_filters(commands.add_parser("reminders", help="List reminders with their scheduler state (filtered by fire time)"))
+    reminders.add_argument("--due", action="store_true", help="Only reminders the scheduler would send (or catch up) right now")
+    commands.add_parser("stats", help="Counts, reminder lag, next tick and table/index sizes")
+    commands.add_parser("schema", help="Tables, indexes and triggers")
+    args = parser.parse_args()
+
+    args.now = args.now or datetime.datetime.utcnow()
+    # The planner goes through the storage layer; pin it to this file whatever DB_BACKEND says
+    database.use_backend("sqlite", f"file:{args.db}?mode=ro")
+    handler = {"events": cmd_events, "reminders": cmd_reminders, "stats": cmd_stats, "schema": cmd_schema}[args.command]
+    db = connect(args.db)
+    try:
+        handler(db, args, Output(args.json))
+    except BrokenPipeError:
+        # Piped into head/less and closed early
+        sys.stderr.close()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
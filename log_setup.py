@@ -0,0 +1,105 @@
+import copy
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+
+# Environment knobs:
+#   LOG_LEVEL        root level (default INFO)
+#   LOG_LEVELS       per-module overrides, e.g. "cogs.scheduler=DEBUG,discord=WARNING"
+#   LOG_FORMAT       "text" (default) or "json"
+#   LOG_RATE_LIMIT   seconds during which a repeated warning/error is only logged once (default 60)
+
+_listener = None
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues records without formatting them on the caller's thread.
+    The stock QueueHandler renders tracebacks in prepare(), which would put that cost back on the event loop.
+    """
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+class RateLimitFilter(logging.Filter):
+    """Drops repeats of the same WARNING+ record within `window` seconds and reports how many were dropped."""
+    def __init__(self, window=60):
+        super().__init__()
+        self.window = window
+        self._seen = {} # key -> [first_seen, suppressed_count]
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING or self.window <= 0:
+            return True
+
+        key = (record.name, record.pathname, record.lineno, str(record.msg))
+        now = time.monotonic()
+        seen = self._seen.get(key)
+        if seen and now - seen[0] < self.window:
+            seen[1] += 1
+            return False
+
+        if seen and seen[1]:
+            record.msg = f"{record.msg} (suppressed {seen[1]} repeat(s) in the last {self.window}s)"
+        self._seen[key] = [now, 0]
+        if len(self._seen) > 1000:
+            self._seen = {k: v for k, v in self._seen.items() if now - v[0] < self.window}
+        return True
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+def setup_logging():
+    """
+    Routes all logging through a queue to a background thread that does the formatting and writing,
+    so a slow stdout (pipe, terminal) never blocks the event loop. Safe to call more than once.
+    """
+    global _listener
+    if _listener:
+        return _listener
+
+    if os.getenv("LOG_FORMAT", "text").lower() == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s %(levelname)-7s %(name)s: %(message)s", "%Y-%m-%d %H:%M:%S")
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    handler = NonBlockingQueueHandler(log_queue)
+    handler.addFilter(RateLimitFilter(float(os.getenv("LOG_RATE_LIMIT", "60"))))
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
+    for override in filter(None, os.getenv("LOG_LEVELS", "").split(",")):
+        name, _, level = override.partition("=")
+        logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+def shutdown_logging():
+    """Flushes queued records and stops the writer thread."""
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
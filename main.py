@@ -2,11 +2,17 @@ import discord
 from discord.ext import commands
 import os
 import asyncio
+import logging
 from dotenv import load_dotenv
 import database
+import diagnostics
+import feeds
+import log_setup
 
 # Load environment variables
 load_dotenv()
+log_setup.setup_logging()
+logger = logging.getLogger("main")
 
 # Bot setup
 intents = discord.Intents.default()
@@ -29,32 +35,43 @@ async def sync(ctx):
 
 @bot.event
 async def on_ready():
-    print(f"Logged in as {bot.user} (ID: {bot.user.id})")
-    await database.init_db()
-    print("Database initialized.")
-    
+    logger.info("Logged in as %s (ID: %s)", bot.user, bot.user.id)
+
     # Sync slash commands
     try:
         synced = await bot.tree.sync()
-        print(f"Synced {len(synced)} command(s)")
+        logger.info("Synced %d command(s)", len(synced))
     except Exception as e:
-        print(f"Failed to sync commands: {e}")
-        
-    print("------")
+        logger.error("Failed to sync commands: %s", e)
+
 
 async def main():
     async with bot:
+        # Event-loop lag heartbeat (+ asyncio debug mode if LOOP_DEBUG=1)
+        bot.loop_monitor = diagnostics.start()
+
         # Load extensions
         await bot.load_extension("cogs.events")
         await bot.load_extension("cogs.scheduler")
         await bot.load_extension("cogs.tips")
+        await bot.load_extension("cogs.admin")
         
         token = os.getenv("DISCORD_TOKEN")
         if not token or token == "your_token_here":
-            print("Error: DISCORD_TOKEN not found in .env or is default value.")
+            logger.error("Error: DISCORD_TOKEN not found in .env or is default value.")
             return
-        
-        await bot.start(token)
+
+        # Migrate before anything can read the DB (commands, feeds, the scheduler's catch-up)
+        await database.init_db()
+        logger.info("Database initialized.")
+
+        # Optional read-only ICS/JSON feeds (FEED_SERVER=1)
+        feed_server = await feeds.start_from_env()
+        try:
+            await bot.start(token)
+        finally:
+            if feed_server:
+                await feed_server.stop()
 
 if __name__ == "__main__":
     try:
@@ -62,3 +79,5 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         # Handle Ctrl+C gracefully
         pass
+    finally:
+        log_setup.shutdown_logging()
@@ -0,0 +1,420 @@
+import bisect
+import datetime
+import itertools
+import uuid
+from constants import EventConfig
+import database
+from database import ReminderRecord, parse_event_time
+
+# Process-local storage engine behind database.py (DB_BACKEND=memory). Nothing is persisted.
+# Mirrors the SQLite schema and query semantics, with sorted lists standing in for the indexes:
+#   _by_time       (event_time, event_id)          ~ events(event_time)
+#   _guild_events  guild_id -> [(event_time, id)]  ~ idx_events_guild_time
+#   _pending       (fire_at, reminder_id), unsent  ~ idx_reminders_due
+#   _outbox_due    (next_attempt_at, outbox_id)    ~ idx_outbox_pending
+#   conflicts      event_id -> {other_id}          ~ event_conflicts, kept by the same neighbour checks as its triggers
+#   archive        month -> guild_id -> [(event_time, id, row)]  ~ events_archive primary key
+# Timestamps are kept as the same strings SQLite would store, so comparisons and output match.
+
+EVENT_COLUMNS = (
+    "id", "guild_id", "name", "event_time", "description", "reminder_30_sent", "reminder_5_sent",
+    "event_type", "coordinates", "repeat_config", "icon_url", "color_hex", "duration", "series_id", "end_time",
+)
+
+def _ts(value):
+    """The string sqlite3 would store for a timestamp parameter."""
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(" ")
+    return value
+
+def _end_time(event_time, duration):
+    """What SQLite's datetime() yields for events.end_time."""
+    return (parse_event_time(event_time) + datetime.timedelta(minutes=duration or 0)).strftime("%Y-%m-%d %H:%M:%S")
+
+def _remove(sorted_list, item):
+    index = bisect.bisect_left(sorted_list, item)
+    if index < len(sorted_list) and sorted_list[index] == item:
+        del sorted_list[index]
+
+class MemoryStore:
+    def __init__(self):
+        self.events = {}
+        self.reminders = {} # id -> {"event_id", "offset_minutes", "fire_at", "sent"}
+        self.event_reminders = {} # event_id -> {offset_minutes: reminder_id}
+        self.outbox = {}
+        self.dedupe_keys = set()
+        self.guild_channels = {}
+        self.archive = {}
+        self.conflicts = {}
+
+        self._by_time = []
+        self._guild_events = {}
+        self._pending = []
+        self._outbox_due = []
+
+        self._event_ids = itertools.count(1)
+        self._reminder_ids = itertools.count(1)
+        self._outbox_ids = itertools.count(1)
+
+    # --- Internal helpers -------------------------------------------------
+
+    def _insert_event(self, guild_id, name, event_time, description, event_type, coordinates,
+                      repeat_config, icon_url, color_hex, duration=0, series_id=None):
+        event_id = next(self._event_ids)
+        event_time = _ts(event_time)
+        self.events[event_id] = dict(zip(EVENT_COLUMNS, (
+            event_id, guild_id, name, event_time, description, 0, 0,
+            event_type, coordinates, repeat_config, icon_url, color_hex, duration, series_id, _end_time(event_time, duration),
+        )))
+        bisect.insort(self._by_time, (event_time, event_id))
+        bisect.insort(self._guild_events.setdefault(guild_id, []), (event_time, event_id))
+        self._link_conflicts(event_id)
+
+        offsets = self.event_reminders[event_id] = {}
+        start = parse_event_time(event_time)
+        for offset in EventConfig.get_reminder_offsets(name):
+            reminder_id = next(self._reminder_ids)
+            fire_at = _ts(start - datetime.timedelta(minutes=offset))
+            self.reminders[reminder_id] = {"event_id": event_id, "offset_minutes": offset, "fire_at": fire_at, "sent": 0}
+            offsets[offset] = reminder_id
+            bisect.insort(self._pending, (fire_at, reminder_id))
+        return event_id
+
+    def _remove_event(self, event_id):
+        self._unlink_conflicts(event_id)
+        event = self.events.pop(event_id)
+        _remove(self._by_time, (event["event_time"], event_id))
+        _remove(self._guild_events[event["guild_id"]], (event["event_time"], event_id))
+        for reminder_id in self.event_reminders.pop(event_id, {}).values():
+            reminder = self.reminders.pop(reminder_id)
+            if not reminder["sent"]:
+                _remove(self._pending, (reminder["fire_at"], reminder_id))
+        return event
+
+    def _link_conflicts(self, event_id):
+        """Records every overlap of the event with its neighbours, found by a bounded range on the guild index."""
+        event = self.events[event_id]
+        index = self._guild_events[event["guild_id"]]
+        lowest = (parse_event_time(event["event_time"]) - datetime.timedelta(minutes=database.MAX_EVENT_DURATION)).strftime("%Y-%m-%d %H:%M:%S")
+        linked = self.conflicts.setdefault(event_id, set())
+        for event_time, other_id in index[bisect.bisect_right(index, (lowest, float("inf"))):bisect.bisect_left(index, (event["end_time"],))]:
+            if other_id != event_id and self.events[other_id]["end_time"] > event["event_time"]:
+                linked.add(other_id)
+                self.conflicts.setdefault(other_id, set()).add(event_id)
+
+    def _unlink_conflicts(self, event_id):
+        for other_id in self.conflicts.pop(event_id, ()):
+            self.conflicts[other_id].discard(event_id)
+
+    def _set_sent(self, reminder_id):
+        reminder = self.reminders[reminder_id]
+        if not reminder["sent"]:
+            reminder["sent"] = 1
+            _remove(self._pending, (reminder["fire_at"], reminder_id))
+
+    def _due(self, now, started_filter):
+        now = _ts(now)
+        due = []
+        for fire_at, reminder_id in self._pending[:bisect.bisect_right(self._pending, (now, float("inf")))]:
+            reminder = self.reminders[reminder_id]
+            event = self.events.get(reminder["event_id"])
+            if event is None or (started_filter and not event["event_time"] > now):
+                continue
+            # A smaller tier that is also due supersedes this one
+            siblings = self.event_reminders[reminder["event_id"]]
+            if any(offset < reminder["offset_minutes"] and self.reminders[other]["fire_at"] <= now
+                   for offset, other in siblings.items()):
+                continue
+            due.append(ReminderRecord(
+                reminder_id, reminder["offset_minutes"], fire_at, event["id"], event["guild_id"],
+                event["event_time"], event["event_type"], event["name"],
+            ))
+        return due
+
+    def _series(self, guild_id, series_id):
+        return [event_id for event_id, e in self.events.items() if e["guild_id"] == guild_id and e["series_id"] == series_id]
+
+    # --- Storage interface (same signatures as database.py) ---------------
+
+    async def init_db(self):
+        pass
+
+    async def set_guild_channel(self, guild_id, channel_id):
+        self.guild_channels[guild_id] = channel_id
+
+    async def get_guild_channel(self, guild_id):
+        return self.guild_channels.get(guild_id)
+
+    async def get_all_guild_channels(self):
+        return [(guild_id, channel_id) for guild_id, channel_id in self.guild_channels.items() if channel_id is not None]
+
+    async def add_event(self, guild_id, name, event_time, description, event_type, coordinates, repeat_config, icon_url, color_hex, duration=0, series_id=None):
+        event_id = self._insert_event(guild_id, name, event_time, description, event_type, coordinates,
+                                      repeat_config, icon_url, color_hex, duration, series_id)
+        database._bump_guild_version(guild_id)
+        return event_id
+
+    async def add_series(self, guild_id, name, event_times, description, event_type, coordinates, repeat_config, icon_url, color_hex, duration=0):
+        series_id = uuid.uuid4().hex
+        for event_time in event_times:
+            self._insert_event(guild_id, name, event_time, description, event_type, coordinates,
+                               repeat_config, icon_url, color_hex, duration, series_id)
+        database._bump_guild_version(guild_id)
+        return series_id
+
+    async def delete_series(self, guild_id, series_id):
+        event_ids = self._series(guild_id, series_id)
+        for event_id in event_ids:
+            self._remove_event(event_id)
+        database._bump_guild_version(guild_id)
+        return len(event_ids)
+
+    async def shift_series(self, guild_id, series_id, minutes, now=None):
+        now = _ts(now or datetime.datetime.utcnow())
+        delta = datetime.timedelta(minutes=minutes)
+        event_ids = self._series(guild_id, series_id)
+        for event_id in event_ids:
+            event = self.events[event_id]
+            # datetime() in SQLite drops fractional seconds
+            new_time = (parse_event_time(event["event_time"]) + delta).strftime("%Y-%m-%d %H:%M:%S")
+            _remove(self._by_time, (event["event_time"], event_id))
+            _remove(self._guild_events[guild_id], (event["event_time"], event_id))
+            event["event_time"] = new_time
+            event["end_time"] = _end_time(new_time, event["duration"])
+            bisect.insort(self._by_time, (new_time, event_id))
+            bisect.insort(self._guild_events[guild_id], (new_time, event_id))
+            self._unlink_conflicts(event_id)
+            self._link_conflicts(event_id)
+
+            for reminder_id in self.event_reminders[event_id].values():
+                reminder = self.reminders[reminder_id]
+                new_fire_at = (parse_event_time(reminder["fire_at"]) + delta).strftime("%Y-%m-%d %H:%M:%S")
+                if not reminder["sent"]:
+                    _remove(self._pending, (reminder["fire_at"], reminder_id))
+                reminder["fire_at"] = new_fire_at
+                if new_fire_at > now:
+                    reminder["sent"] = 0
+                if not reminder["sent"]:
+                    bisect.insort(self._pending, (new_fire_at, reminder_id))
+        database._bump_guild_version(guild_id)
+        return len(event_ids)
+
+    async def set_series_duration(self, guild_id, series_id, duration):
+        event_ids = self._series(guild_id, series_id)
+        for event_id in event_ids:
+            event = self.events[event_id]
+            event["duration"] = duration
+            event["end_time"] = _end_time(event["event_time"], duration)
+            self._unlink_conflicts(event_id)
+            self._link_conflicts(event_id)
+        database._bump_guild_version(guild_id)
+        return len(event_ids)
+
+    async def get_all_events(self, guild_id=None):
+        if guild_id:
+            index = self._guild_events.get(guild_id, [])
+        else:
+            index = self._by_time
+        return [dict(self.events[event_id]) for _, event_id in index]
+
+    async def iter_events(self, guild_id):
+        for _, event_id in list(self._guild_events.get(guild_id, [])):
+            if event_id in self.events:
+                yield dict(self.events[event_id])
+
+    async def get_event(self, event_id, guild_id):
+        event = self.events.get(event_id)
+        if event is None or event["guild_id"] != guild_id:
+            return None
+        return dict(event)
+
+    async def get_event_index(self, guild_id):
+        return [(event_id, self.events[event_id]["name"], event_time) for event_time, event_id in self._guild_events.get(guild_id, [])]
+
+    async def get_event_conflicts(self, guild_id, event_ids=(), series_id=None):
+        wanted = set(event_ids)
+        if series_id is not None:
+            wanted.update(self._series(guild_id, series_id))
+        key = lambda event_id: (self.events[event_id]["event_time"], event_id)
+        conflicts = {}
+        for event_id in sorted((i for i in wanted if i in self.events and self.events[i]["guild_id"] == guild_id), key=key):
+            others = sorted(self.conflicts.get(event_id, ()), key=key)
+            if others:
+                conflicts[event_id] = [(other_id, self.events[other_id]["name"], self.events[other_id]["event_time"]) for other_id in others]
+        return conflicts
+
+    async def delete_event(self, event_id, guild_id=None):
+        event = self.events.get(event_id)
+        if event is None or (guild_id is not None and event["guild_id"] != guild_id):
+            return False
+        self._remove_event(event_id)
+        database._bump_guild_version(event["guild_id"])
+        return True
+
+    async def search_events(self, guild_id, query, limit=10):
+        """Substring match on every term; events matching more terms in the name rank first, then by time."""
+        terms = [t.lower() for t in query.split()]
+        if not terms:
+            return []
+        hits = []
+        for event_time, event_id in self._guild_events.get(guild_id, []):
+            event = self.events[event_id]
+            name = (event["name"] or "").lower()
+            description = (event["description"] or "").lower()
+            if all(t in name or t in description for t in terms):
+                hits.append((-sum(t in name for t in terms), event_time, event_id))
+        hits.sort()
+        return [dict(self.events[event_id], snippet=None) for _, _, event_id in hits[:limit]]
+
+    async def get_upcoming_reminders(self, now=None):
+        return self._due(now or datetime.datetime.utcnow(), started_filter=True)
+
+    async def get_missed_reminders(self, now=None):
+        return self._due(now or datetime.datetime.utcnow(), started_filter=False)
+
+    async def get_next_due_at(self, now=None):
+        now = _ts(now or datetime.datetime.utcnow())
+        candidates = []
+        for fire_at, reminder_id in self._pending:
+            event = self.events.get(self.reminders[reminder_id]["event_id"])
+            if event is not None and event["event_time"] > now:
+                candidates.append(fire_at)
+                break
+        if self._outbox_due:
+            candidates.append(self._outbox_due[0][0])
+        return parse_event_time(min(candidates)) if candidates else None
+
+    async def mark_reminder_sent(self, reminder_id):
+        reminder = self.reminders.get(reminder_id)
+        if reminder is None:
+            return
+        for offset, other in self.event_reminders[reminder["event_id"]].items():
+            if offset >= reminder["offset_minutes"]:
+                self._set_sent(other)
+
+    async def enqueue_due_reminders(self, now=None):
+        now = _ts(now or datetime.datetime.utcnow())
+        due = self._due(now, started_filter=True)
+        if not due:
+            return 0
+
+        queued = 0
+        for r in due:
+            dedupe_key = f"{r.event_id}:{r.offset_minutes}:{r.fire_at}"
+            if dedupe_key in self.dedupe_keys:
+                continue
+            queued += 1
+            self.dedupe_keys.add(dedupe_key)
+            outbox_id = next(self._outbox_ids)
+            self.outbox[outbox_id] = {
+                "dedupe_key": dedupe_key, "reminder_id": r.reminder_id, "event_id": r.event_id, "guild_id": r.guild_id,
+                "status": "pending", "attempts": 0, "next_attempt_at": now, "last_error": None,
+                "created_at": now, "sent_at": None,
+            }
+            bisect.insort(self._outbox_due, (now, outbox_id))
+
+        due_events = {r.event_id for r in due}
+        for fire_at, reminder_id in self._pending[:bisect.bisect_right(self._pending, (now, float("inf")))]:
+            if self.reminders[reminder_id]["event_id"] in due_events:
+                self._set_sent(reminder_id)
+        return queued
+
+    async def fetch_outbox_batch(self, limit=50, now=None):
+        now = _ts(now or datetime.datetime.utcnow())
+        batch = []
+        for next_attempt_at, outbox_id in self._outbox_due:
+            if next_attempt_at > now or len(batch) >= limit:
+                break
+            entry = self.outbox[outbox_id]
+            reminder = self.reminders.get(entry["reminder_id"]) or {}
+            event = self.events.get(entry["event_id"]) or {}
+            batch.append(ReminderRecord(
+                entry["reminder_id"], reminder.get("offset_minutes"), reminder.get("fire_at"), entry["event_id"],
+                entry["guild_id"], event.get("event_time"), event.get("event_type"), event.get("name"),
+                outbox_id, entry["attempts"],
+            ))
+        return batch
+
+    async def get_event_descriptions(self, event_ids):
+        return {event_id: self.events[event_id]["description"] for event_id in event_ids if event_id in self.events}
+
+    async def ack_outbox(self, outbox_ids, now=None):
+        now = _ts(now or datetime.datetime.utcnow())
+        for outbox_id in outbox_ids:
+            entry = self.outbox.get(outbox_id)
+            if entry is None:
+                continue
+            if entry["status"] == "pending":
+                _remove(self._outbox_due, (entry["next_attempt_at"], outbox_id))
+            entry["status"] = "sent"
+            entry["sent_at"] = now
+
+    async def retry_outbox(self, outbox_id, error, delay_seconds, max_attempts=5, now=None):
+        entry = self.outbox.get(outbox_id)
+        if entry is None:
+            return
+        if entry["status"] == "pending":
+            _remove(self._outbox_due, (entry["next_attempt_at"], outbox_id))
+        entry["attempts"] += 1
+        entry["last_error"] = error[:500]
+        entry["next_attempt_at"] = _ts((now or datetime.datetime.utcnow()) + datetime.timedelta(seconds=delay_seconds))
+        entry["status"] = "dead" if entry["attempts"] >= max_attempts else "pending"
+        if entry["status"] == "pending":
+            bisect.insort(self._outbox_due, (entry["next_attempt_at"], outbox_id))
+
+    async def archive_old_events(self, now=None, batch_size=database.ARCHIVE_BATCH_SIZE):
+        now = now or datetime.datetime.utcnow()
+        cutoff = _ts(now - database.ARCHIVE_AFTER)
+        expired = self._by_time[:bisect.bisect_left(self._by_time, (cutoff,))]
+        guild_ids = set()
+        for _, event_id in expired:
+            event = self._remove_event(event_id)
+            row = {"month": event["event_time"][:7], **{field: event[field] for field in database.ARCHIVE_FIELDS}, "archived_at": _ts(now)}
+            partition = self.archive.setdefault(row["month"], {}).setdefault(event["guild_id"], [])
+            bisect.insort(partition, (row["event_time"], event_id, row))
+            guild_ids.add(event["guild_id"])
+        for outbox_id in [i for i, e in self.outbox.items() if e["status"] != "pending" and e["event_id"] not in self.events]:
+            self.dedupe_keys.discard(self.outbox.pop(outbox_id)["dedupe_key"])
+        for guild_id in guild_ids:
+            database._bump_guild_version(guild_id)
+        return len(expired)
+
+    async def get_event_history(self, guild_id, start, end, limit=None):
+        start, end = _ts(start), _ts(end)
+        rows = []
+        for month in database.archive_months(parse_event_time(start), parse_event_time(end)):
+            partition = self.archive.get(month, {}).get(guild_id, [])
+            rows.extend(row for event_time, _, row in partition if start <= event_time < end)
+        rows.sort(key=lambda row: (row["event_time"], row["id"]))
+        return [dict(row) for row in rows[:limit]]
+
+    async def import_events(self, guild_id, rows, chunk_size=database.IMPORT_CHUNK_SIZE):
+        stats = {"imported": 0, "duplicates": 0, "errors": []}
+        error_count = 0
+        existing = {
+            (self.events[event_id]["name"], parse_event_time(event_time).replace(second=0, microsecond=0))
+            for event_time, event_id in self._guild_events.get(guild_id, [])
+        }
+        for row_number, raw in enumerate(rows, 1):
+            try:
+                event = database.validate_import_row(raw)
+            except (ValueError, TypeError, AttributeError) as e:
+                error_count += 1
+                if len(stats["errors"]) < 10:
+                    stats["errors"].append(f"row {row_number}: {e}")
+                continue
+            key = (event["name"], event["event_time"])
+            if key in existing:
+                stats["duplicates"] += 1
+                continue
+            existing.add(key)
+            color, icon = EventConfig.get_event_metadata(event["name"])
+            self._insert_event(guild_id, event["name"], event["event_time"], event["description"], event["name"],
+                               None, event["repeat_config"], icon, color, event["duration"])
+            stats["imported"] += 1
+
+        if error_count > len(stats["errors"]):
+            stats["errors"].append(f"... and {error_count - len(stats['errors'])} more")
+        if stats["imported"]:
+            database._bump_guild_version(guild_id)
+        return stats
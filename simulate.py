@@ -0,0 +1,166 @@
+import argparse
+import asyncio
+import datetime
+import logging
+import random
+import statistics
+import time
+
+import aiosqlite
+import database
+from cogs.scheduler import Scheduler
+from constants import EventConfig
+
+# Replays a synthetic schedule through the real Scheduler cog against an in-memory DB,
+# advancing a fake clock tick by tick instead of waiting in real time.
+# Usage: python simulate.py --days 30 --guilds 5 [--backend memory]
+
+# (event name, repeat interval, first occurrence offset from the simulation start)
+SCHEDULE = [
+    ("Bear / 熊", datetime.timedelta(days=1), datetime.timedelta(hours=12)),
+    ("Shield / 護盾", datetime.timedelta(hours=8), datetime.timedelta(hours=3)),
+    ("Viking / 維京", datetime.timedelta(days=2), datetime.timedelta(hours=20)),
+    ("Swordland / 聖劍", datetime.timedelta(days=7), datetime.timedelta(days=2, hours=14)),
+    ("KvK & Castle / KvK & 王城戰", datetime.timedelta(days=14), datetime.timedelta(days=5, hours=13)),
+]
+
+class SimClock:
+    """Naive-UTC clock that only moves when told to."""
+    def __init__(self, start):
+        self.current = start
+
+    def __call__(self):
+        return self.current
+
+    def advance(self, delta):
+        self.current += delta
+
+class SimChannel:
+    def __init__(self, channel_id):
+        self.id = channel_id
+        self.messages = 0
+
+    async def send(self, content=None, embed=None, embeds=None):
+        self.messages += 1
+
+class SimBot:
+    """Just enough of commands.Bot for the Scheduler cog."""
+    def __init__(self):
+        self.channels = {}
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    async def fetch_channel(self, channel_id):
+        return self.channels.setdefault(channel_id, SimChannel(channel_id))
+
+    async def wait_until_ready(self):
+        pass
+
+async def populate(start, end, guilds, seed):
+    """Creates the synthetic schedule and returns (event count, expected reminder count)."""
+    rng = random.Random(seed)
+    events = 0
+    expected = 0
+    for guild_id in range(1, guilds + 1):
+        await database.set_guild_channel(guild_id, 1000 + guild_id)
+        for name, interval, first in SCHEDULE:
+            color, icon = EventConfig.get_event_metadata(name)
+            duration = EventConfig.get_event_duration(name)
+            # Stagger guilds so their events don't all land on the same minute
+            when = start + first + datetime.timedelta(minutes=rng.randint(0, 59))
+            while when < end:
+                await database.add_event(guild_id, name, when, "Simulated event", name, None, None, icon, color, duration)
+                events += 1
+                expected += sum(
+                    1 for offset in EventConfig.get_reminder_offsets(name)
+                    if start <= when - datetime.timedelta(minutes=offset) < end
+                )
+                when += interval
+    return events, expected
+
+async def run(days, guilds, tick_seconds, seed, quiet, backend="sqlite", adaptive=False):
+    keeper = None
+    if backend == "memory":
+        database.use_backend("memory")
+    else:
+        database.use_backend("sqlite", "file:simulation?mode=memory&cache=shared")
+        # A shared-cache memory DB only lives while a connection is open
+        keeper = await aiosqlite.connect(database.DB_NAME, uri=True)
+    try:
+        await database.init_db()
+
+        start = datetime.datetime(2030, 1, 7)
+        end = start + datetime.timedelta(days=days)
+        events, expected = await populate(start, end, guilds, seed)
+
+        clock = SimClock(start)
+        bot = SimBot()
+        cog = Scheduler(bot, clock=clock, autostart=False)
+
+        fired = []
+        send_reminder_digest = cog.send_reminder_digest
+
+        async def recording_send(channel, chunk):
+            fired.extend((event, clock()) for event, _ in chunk)
+            await send_reminder_digest(channel, chunk)
+
+        cog.send_reminder_digest = recording_send
+
+        tick = datetime.timedelta(seconds=tick_seconds)
+        ticks = 0
+        wall_start = time.perf_counter()
+        while clock() < end:
+            await cog.run_tick()
+            # Adaptive: sleep as long as the scheduler itself planned to
+            clock.advance(datetime.timedelta(seconds=cog.metrics["interval_s"]) if adaptive else tick)
+            ticks += 1
+        wall = time.perf_counter() - wall_start
+    finally:
+        if keeper:
+            await keeper.close()
+
+    lateness = []
+    seen = set()
+    duplicates = 0
+    by_tier = {}
+    for event, sent_at in fired:
+        late = (sent_at - database.parse_event_time(event.fire_at)).total_seconds()
+        lateness.append(late)
+        by_tier[event.offset_minutes] = by_tier.get(event.offset_minutes, 0) + 1
+        key = (event.event_id, event.offset_minutes)
+        duplicates += key in seen
+        seen.add(key)
+        if not quiet:
+            print(f"{sent_at:%Y-%m-%d %H:%M:%S}  guild={event.guild_id:<3} {event.offset_minutes:>3}m  "
+                  f"late={late:5.0f}s  {event.name} @ {event.event_time}")
+
+    print()
+    cadence = "adaptive ticks" if adaptive else f"ticks of {tick_seconds}s"
+    print(f"Simulated {days} day(s) for {guilds} guild(s) on {backend}: {ticks} {cadence} in {wall:.2f}s wall")
+    print(f"Events: {events} | reminders expected: {expected} | fired: {len(fired)} | "
+          f"missing: {expected - len(seen)} | duplicates: {duplicates}")
+    print("By tier: " + ", ".join(f"{offset}m={count}" for offset, count in sorted(by_tier.items(), reverse=True)))
+    if lateness:
+        lateness.sort()
+        p95 = lateness[min(len(lateness) - 1, int(len(lateness) * 0.95))]
+        print(f"Lateness (s): avg {statistics.mean(lateness):.1f} | p50 {statistics.median(lateness):.1f} | "
+              f"p95 {p95:.1f} | max {lateness[-1]:.1f}")
+    messages = sum(channel.messages for channel in bot.channels.values())
+    print(f"Messages sent: {messages} ({len(fired) / max(messages, 1):.2f} reminders/message)")
+    print(f"Throughput: {len(fired) / wall:.1f} reminders/s, {ticks / wall:.0f} ticks/s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a synthetic schedule through the scheduler in fast-forward.")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--guilds", type=int, default=3)
+    parser.add_argument("--tick-seconds", type=int, default=60, help="Simulated time between scheduler ticks")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary")
+    parser.add_argument("--backend", choices=("sqlite", "memory"), default="sqlite",
+                        help="sqlite: shared-cache in-memory SQLite (real queries); memory: the pure-Python store")
+    parser.add_argument("--adaptive", action="store_true", help="Advance by the scheduler's planned interval instead of --tick-seconds")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args.days, args.guilds, args.tick_seconds, args.seed, args.quiet, args.backend, args.adaptive))
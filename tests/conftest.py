@@ -0,0 +1,30 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Add parent directory to path to import database
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+@pytest.fixture
+def blank_db():
+    """An empty SQLite file selected as the backend; the backend is reset and the file removed afterwards."""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    database.use_backend("sqlite", path)
+    try:
+        yield path
+    finally:
+        database.use_backend(None)
+        database.DB_NAME = None
+        os.remove(path)
+
+@pytest.fixture
+def temp_db(blank_db):
+    """A fresh, fully migrated SQLite database for one test."""
+    asyncio.run(database.init_db())
+    return blank_db
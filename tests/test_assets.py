@@ -0,0 +1,50 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path to import assets
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import assets
+
+Image = pytest.importorskip("PIL.Image")
+
+def make_png(path, color, size=(64, 64)):
+    Image.new("RGB", size, color).save(path, "PNG")
+    return str(path)
+
+def test_variants_are_cached_by_content_and_settings(tmp_path, monkeypatch):
+    monkeypatch.setenv("TIPS_CACHE_DIR", str(tmp_path / "cache"))
+    encodes = []
+    encode = assets._encode
+    monkeypatch.setattr(assets, "_encode", lambda path, settings: encodes.append(settings) or encode(path, settings))
+    source = make_png(tmp_path / "Bear_1.png", "red")
+    settings = assets.AssetSettings()
+
+    (variant, filename), = asyncio.run(assets.prepare([source], settings))
+    assert filename == "Bear_1.webp" and os.path.dirname(variant) == str(tmp_path / "cache")
+    assert os.path.getsize(variant) < os.path.getsize(source)
+
+    # Second call is a cache hit
+    assert asyncio.run(assets.prepare([source], settings)) == [(variant, filename)]
+    assert len(encodes) == 1
+
+    # Other encode settings or other content get their own entry
+    lossy, _ = assets.optimize(source, settings._replace(quality=80))
+    make_png(source, "blue", (64, 48))
+    changed, _ = assets.optimize(source, settings)
+    assert len({variant, lossy, changed}) == 3 and len(encodes) == 3
+    assert sorted(os.listdir(tmp_path / "cache")) == sorted(os.path.basename(p) for p in (variant, lossy, changed))
+
+def test_original_is_served_when_reencoding_does_not_help(tmp_path, monkeypatch):
+    monkeypatch.setenv("TIPS_CACHE_DIR", str(tmp_path / "cache"))
+    source = make_png(tmp_path / "Viking_5.png", "green")
+    encodes = []
+    monkeypatch.setattr(assets, "_encode", lambda path, settings: encodes.append(settings) or b"x" * (os.path.getsize(path) + 1))
+
+    assert assets.optimize(source, assets.AssetSettings()) == (source, "Viking_5.png")
+    assert assets.optimize(source, assets.AssetSettings()) == (source, "Viking_5.png")
+    assert len(encodes) == 1
+    assert not (tmp_path / "cache").exists()
@@ -0,0 +1,44 @@
+import asyncio
+import datetime
+import gzip
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Add parent directory to path to import database
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import backup
+import database
+
+def test_snapshot_is_compressed_checked_and_rotated(temp_db, tmp_path, monkeypatch):
+    monkeypatch.setenv("BACKUP_DIR", str(tmp_path / "backups"))
+    monkeypatch.setenv("BACKUP_KEEP", "2")
+
+    async def scenario():
+        await database.add_event(1, "Bear / 熊", datetime.datetime(2030, 1, 1, 12), "", "Bear / 熊", None, None, "", 0)
+        results = []
+        for stamp in ("20200101-000000", "20200102-000000", "20200103-000000"):
+            results.append(await backup.create_snapshot())
+            # Snapshots are named by the second they were taken in; rename so the test doesn't have to sleep
+            os.replace(results[-1]["path"], os.path.join(backup.backup_dir(), f"scheduler-{stamp}.db.gz"))
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert [r["rotated"] for r in results] == [0, 0, 1]
+    snapshots = backup.list_snapshots()
+    assert [os.path.basename(p) for p in snapshots] == ["scheduler-20200103-000000.db.gz", "scheduler-20200102-000000.db.gz"]
+
+    restored = tmp_path / "restored.db"
+    with gzip.open(snapshots[0], "rb") as src, open(restored, "wb") as dst:
+        dst.write(src.read())
+    with sqlite3.connect(restored) as db:
+        assert db.execute("SELECT name FROM events").fetchall() == [("Bear / 熊",)]
+
+def test_memory_backend_has_nothing_to_back_up(blank_db):
+    database.use_backend("memory")
+    with pytest.raises(RuntimeError, match="memory"):
+        asyncio.run(backup.create_snapshot())
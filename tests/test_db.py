@@ -8,17 +8,21 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import database
 
-async def test_db():
+async def check_db():
+    # In-memory backend: no scheduler.db on disk, no state shared with a running bot
+    database.use_backend("memory")
+
     print("Initializing DB...")
     await database.init_db()
     
     print("Adding event...")
-    now = datetime.datetime.now()
-    future_30 = now + datetime.timedelta(minutes=30)
-    future_5 = now + datetime.timedelta(minutes=5)
+    now = datetime.datetime.utcnow()
+    # Both reminders come due 15 minutes from now (15m shield tier, 5m bear tier)
+    shield_time = now + datetime.timedelta(minutes=30)
+    bear_time = now + datetime.timedelta(minutes=20)
     
-    await database.add_event("Test Event 30m", future_30, "Description 30m")
-    await database.add_event("Test Event 5m", future_5, "Description 5m")
+    await database.add_event(1, "Shield / 護盾", shield_time, "Description shield", "Shield / 護盾", None, None, "", 0)
+    await database.add_event(1, "Bear / 熊", bear_time, "Description bear", "Bear / 熊", None, None, "", 0)
     
     print("Listing events...")
     events = await database.get_all_events()
@@ -27,7 +31,7 @@ async def test_db():
         print(f"- {e['name']} at {e['event_time']}")
         
     print("Checking upcoming reminders...")
-    reminders = await database.get_upcoming_reminders()
+    reminders = await database.get_upcoming_reminders(now + datetime.timedelta(minutes=15))
     print(f"Found {len(reminders)} reminders due.")
     
     if len(reminders) >= 2:
@@ -45,5 +49,11 @@ async def test_db():
     else:
         print("FAILURE: Events not deleted.")
 
+    database.use_backend(None)
+    return len(reminders), len(events_after)
+
+def test_db():
+    assert asyncio.run(check_db()) == (2, 0)
+
 if __name__ == "__main__":
-    asyncio.run(test_db())
+    asyncio.run(check_db())
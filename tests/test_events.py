@@ -0,0 +1,100 @@
+import asyncio
+import datetime
+import os
+import sys
+import time
+import types
+
+# Add parent directory to path to import database
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+class FakeTree:
+    def add_command(self, command):
+        pass
+
+    def remove_command(self, name, type=None):
+        pass
+
+class FakeBot:
+    tree = FakeTree()
+
+def test_list_renders_are_shared_and_invalidated(monkeypatch):
+    from cogs import events
+
+    clock = [1000.0]
+    monkeypatch.setattr(events, "time", types.SimpleNamespace(monotonic=lambda: clock[0], perf_counter=time.perf_counter))
+    cog = events.Events(FakeBot())
+    renders = []
+
+    async def render_list_embeds(guild_id, limit):
+        renders.append((guild_id, limit))
+        await asyncio.sleep(0.01)
+        return [f"render {len(renders)}"]
+
+    cog.render_list_embeds = render_list_embeds
+
+    async def scenario():
+        # Concurrent callers wait on one render
+        results = await asyncio.gather(*(cog.get_list_embeds(1, 25) for _ in range(5)))
+        assert results == [["render 1"]] * 5 and len(renders) == 1
+        assert await cog.get_list_embeds(1, 25) == ["render 1"]
+
+        # A write in the guild invalidates the cached result; other guilds are unaffected
+        database._bump_guild_version(2)
+        assert await cog.get_list_embeds(1, 25) == ["render 1"]
+        database._bump_guild_version(1)
+        assert await cog.get_list_embeds(1, 25) == ["render 2"]
+
+        # So does the TTL running out
+        clock[0] += events.LIST_CACHE_TTL - 1
+        assert await cog.get_list_embeds(1, 25) == ["render 2"]
+        clock[0] += 2
+        assert await cog.get_list_embeds(1, 25) == ["render 3"]
+
+    asyncio.run(scenario())
+    assert renders == [(1, 25)] * 3
+
+class FakeResponse:
+    def __init__(self):
+        self.calls = []
+
+    async def send_message(self, content=None, **kwargs):
+        self.calls.append(("send_message", content, kwargs))
+
+    async def edit_message(self, content=None, **kwargs):
+        self.calls.append(("edit_message", content, kwargs))
+
+class FakeInteraction:
+    def __init__(self, guild_id):
+        self.guild = types.SimpleNamespace(id=guild_id)
+        self.response = FakeResponse()
+
+def test_delete_series_asks_first(temp_db):
+    from cogs.events import EventCreationView, SeriesDeleteConfirmView
+
+    async def scenario():
+        times = [datetime.datetime(2030, 1, 1, 12) + datetime.timedelta(days=i) for i in range(3)]
+        series_id = await database.add_series(1, "Bear / 熊", times, "", "Bear / 熊", None, "1d", "", 0, 30)
+        view = EventCreationView(mode="edit", event_id=1, series_id=series_id)
+
+        clicked = FakeInteraction(1)
+        await view.delete_series_button.callback(clicked)
+        (kind, _, kwargs), = clicked.response.calls
+        assert kind == "send_message" and kwargs["ephemeral"]
+        confirm = kwargs["view"]
+        assert isinstance(confirm, SeriesDeleteConfirmView)
+        assert len(await database.get_all_events(1)) == 3
+
+        cancelled = FakeInteraction(1)
+        await SeriesDeleteConfirmView(series_id).cancel_button.callback(cancelled)
+        assert len(await database.get_all_events(1)) == 3
+
+        confirmed = FakeInteraction(1)
+        await confirm.confirm_button.callback(confirmed)
+        (_, content, _), = confirmed.response.calls
+        assert "Deleted 3 event(s)" in content
+        assert await database.get_all_events(1) == []
+
+    asyncio.run(scenario())
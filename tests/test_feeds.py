@@ -0,0 +1,39 @@
+import asyncio
+import datetime
+import os
+import sys
+
+from aiohttp.test_utils import TestClient, TestServer
+
+# Add parent directory to path to import database
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+from feeds import FeedServer
+
+def add(name, when):
+    return database.add_event(1, name, when, "", name, None, None, "", 0)
+
+def test_conditional_requests_follow_writes(temp_db):
+    async def scenario():
+        await add("Bear / 熊", datetime.datetime(2030, 1, 1, 12, 0))
+        async with TestClient(TestServer(FeedServer().app)) as client:
+            first = await client.get("/guilds/1/events.ics")
+            assert first.status == 200
+            body = await first.text()
+            etag, last_modified = first.headers["ETag"], first.headers["Last-Modified"]
+            # Stamped with the generation time, not the event start
+            assert f"DTSTAMP:{datetime.datetime.utcnow():%Y%m%d}" in body
+
+            assert (await client.get("/guilds/1/events.ics", headers={"If-None-Match": etag})).status == 304
+            assert (await client.get("/guilds/1/events.ics", headers={"If-Modified-Since": last_modified})).status == 304
+
+            # A write within the same second still invalidates both validators
+            await add("Shield / 護盾", datetime.datetime(2030, 1, 2, 12, 0))
+            by_etag = await client.get("/guilds/1/events.ics", headers={"If-None-Match": etag})
+            by_date = await client.get("/guilds/1/events.ics", headers={"If-Modified-Since": last_modified})
+            assert by_etag.status == 200 and by_date.status == 200
+            assert by_date.headers["Last-Modified"] != last_modified
+            assert "Shield" in await by_date.text()
+
+    asyncio.run(scenario())
@@ -0,0 +1,82 @@
+import asyncio
+import io
+import os
+import sys
+
+# Add parent directory to path to import database
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+ROWS = [
+    {"name": "Bear / 熊", "event_time": "2030-01-01 12:00", "description": "North gate, bring healers", "repeat_config": "1d"},
+    {"name": "Shield", "event_time": "2030-01-01T20:00", "duration": "0"}, # legacy name, ISO time
+    {"name": "Bear / 熊", "event_time": "2030-01-01 12:00"}, # duplicate
+    {"name": "Dragon", "event_time": "2030-01-02 12:00"}, # unknown type
+]
+
+def test_import_validates_and_dedupes(temp_db):
+    stats = asyncio.run(database.import_events(1, ROWS))
+    assert stats["imported"] == 2
+    assert stats["duplicates"] == 1
+    assert len(stats["errors"]) == 1 and "Dragon" in stats["errors"][0]
+
+    # Importing again only finds duplicates
+    stats = asyncio.run(database.import_events(1, ROWS[:2]))
+    assert stats["imported"] == 0 and stats["duplicates"] == 2
+
+    events = asyncio.run(database.get_all_events(1))
+    assert [e['name'] for e in events] == ["Bear / 熊", "Shield / 護盾"]
+    assert events[0]['duration'] == 30 # Default from EventConfig
+
+def test_export_round_trip(temp_db):
+    asyncio.run(database.import_events(1, ROWS))
+
+    for fmt in ("csv", "json", "ics"):
+        buf = io.StringIO()
+        assert asyncio.run(database.export_events(1, buf, fmt)) == 2
+        buf.seek(0)
+        stats = asyncio.run(database.import_events(2, database.iter_import_rows(buf, fmt)))
+        assert stats["imported"] == 2 or stats["duplicates"] == 2, (fmt, stats)
+        assert not stats["errors"], (fmt, stats)
+
+    exported = asyncio.run(database.get_all_events(2))
+    assert [(e['name'], e['event_time'], e['duration']) for e in exported] == [
+        ("Bear / 熊", "2030-01-01 12:00:00", 30),
+        ("Shield / 護盾", "2030-01-01 20:00:00", 0),
+    ]
+
+ICS = """BEGIN:VCALENDAR
+BEGIN:VEVENT
+SUMMARY:Bear / 熊
+DTSTART:20300101T120000Z
+DTEND:20300101T123000Z
+END:VEVENT
+BEGIN:VEVENT
+SUMMARY:Viking / 維京
+DTSTART;VALUE=DATE:20300102
+END:VEVENT
+BEGIN:VEVENT
+SUMMARY:Shield / 護盾
+DTSTART;TZID=Asia/Taipei:20300103T200000
+DTEND;TZID=Asia/Taipei:20300103T201500
+END:VEVENT
+BEGIN:VEVENT
+SUMMARY:Bear / 熊
+DTSTART;TZID=Mars/Olympus:20300104T120000
+END:VEVENT
+END:VCALENDAR
+"""
+
+def test_ics_bad_vevent_is_a_row_error_and_tzid_is_converted(temp_db):
+    stats = asyncio.run(database.import_events(1, database.iter_import_rows(io.StringIO(ICS), "ics")))
+    assert stats["imported"] == 2
+    assert len(stats["errors"]) == 2
+    assert stats["errors"][0].startswith("row 2:") and "all-day" in stats["errors"][0]
+    assert stats["errors"][1].startswith("row 4:") and "Mars/Olympus" in stats["errors"][1]
+
+    events = asyncio.run(database.get_all_events(1))
+    assert [(e['name'], e['event_time'], e['duration']) for e in events] == [
+        ("Bear / 熊", "2030-01-01 12:00:00", 30),
+        ("Shield / 護盾", "2030-01-03 12:00:00", 15), # 20:00 in Taipei (UTC+8)
+    ]
@@ -0,0 +1,43 @@
+import asyncio
+import datetime
+import json
+import os
+import sys
+
+# Add parent directory to path to import database
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+import inspect_db
+
+NOW = datetime.datetime(2030, 1, 7, 12, 0)
+
+def minutes(n):
+    return NOW + datetime.timedelta(minutes=n)
+
+def run_cli(monkeypatch, capsys, path, *argv):
+    monkeypatch.setattr(sys, "argv", ["inspect_db.py", "--db", path, "--now", str(NOW), "--json", *argv])
+    inspect_db.main()
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+def test_states_match_the_scheduler(temp_db, monkeypatch, capsys):
+    async def scenario():
+        await database.add_event(1, "Bear / 熊", minutes(3), "", "Bear / 熊", None, None, "", 0, 30) # 5m tier due
+        await database.add_event(1, "Bear / 熊", minutes(-30), "", "Bear / 熊", None, None, "", 0, 30) # started, unsent
+        await database.add_event(2, "Bear / 熊", minutes(60), "", "Bear / 熊", None, None, "", 0, 30)
+        return {r.reminder_id for r in await database.get_upcoming_reminders(NOW)}
+
+    due = asyncio.run(scenario())
+    rows = run_cli(monkeypatch, capsys, temp_db, "reminders", "--due")
+    assert {r["id"] for r in rows if r["state"] == "due"} == due
+    assert [r["state"] for r in rows] == ["missed", "due"]
+
+    assert [r["guild_id"] for r in run_cli(monkeypatch, capsys, temp_db, "reminders", "--guild", "2")] == [2]
+    assert len(run_cli(monkeypatch, capsys, temp_db, "events", "--since", str(minutes(0)))) == 2
+
+    # Reads --db even when the environment selects the memory backend
+    monkeypatch.setenv("DB_BACKEND", "memory")
+    monkeypatch.setattr(database, "DB_BACKEND", None)
+    (stats,) = run_cli(monkeypatch, capsys, temp_db, "stats")
+    assert stats["reminders"]["due_now"] == 1 and stats["reminders"]["missed"] == 1
+    assert stats["scheduler"]["reason"] == "backlog"
@@ -0,0 +1,242 @@
+import asyncio
+import datetime
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Add parent directory to path to import database
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+def add(name, minutes_from_now, now):
+    return asyncio.run(database.add_event(
+        1, name, now + datetime.timedelta(minutes=minutes_from_now), "", name, None, None, "", 0
+    ))
+
+def test_shield_gets_both_tiers(temp_db):
+    now = datetime.datetime.utcnow()
+    add("Shield / 護盾", 60, now)
+
+    # Nothing due an hour ahead
+    assert asyncio.run(database.get_upcoming_reminders(now)) == []
+
+    # 15m alert
+    due = asyncio.run(database.get_upcoming_reminders(now + datetime.timedelta(minutes=46)))
+    assert [r.offset_minutes for r in due] == [15]
+    asyncio.run(database.mark_reminder_sent(due[0].reminder_id))
+    assert asyncio.run(database.get_upcoming_reminders(now + datetime.timedelta(minutes=47))) == []
+
+    # 5m reminder
+    due = asyncio.run(database.get_upcoming_reminders(now + datetime.timedelta(minutes=56)))
+    assert [r.offset_minutes for r in due] == [5]
+
+def test_shield_tiers_and_alert_use_one_lookup():
+    from constants import EventConfig
+
+    for name in ("Shield / 護盾", "Shield"):
+        assert EventConfig.is_shield(name) and EventConfig.get_reminder_offsets(name) == [15, 5]
+    # A custom name that merely mentions it gets neither the 15m tier nor the shield alert
+    assert not EventConfig.is_shield("Shield wall drill") and EventConfig.get_reminder_offsets("Shield wall drill") == [5]
+
+def test_late_event_only_sends_smallest_tier(temp_db):
+    now = datetime.datetime.utcnow()
+    add("Shield / 護盾", 3, now)
+    add("Bear / 熊", 3, now)
+
+    due = asyncio.run(database.get_upcoming_reminders(now))
+    assert sorted(r.offset_minutes for r in due) == [5, 5]
+
+    for r in due:
+        asyncio.run(database.mark_reminder_sent(r.reminder_id))
+    # The superseded 15m shield tier is marked too
+    assert asyncio.run(database.get_upcoming_reminders(now)) == []
+
+def test_deleted_event_has_no_reminders(temp_db):
+    now = datetime.datetime.utcnow()
+    event_id = add("Bear / 熊", 3, now)
+    asyncio.run(database.delete_event(event_id))
+    assert asyncio.run(database.get_upcoming_reminders(now)) == []
+
+def test_delete_is_scoped_to_guild(temp_db):
+    now = datetime.datetime.utcnow()
+    event_id = add("Bear / 熊", 3, now)
+    assert asyncio.run(database.delete_event(event_id, guild_id=2)) is False
+    assert asyncio.run(database.get_event(event_id, 1)) is not None
+    assert asyncio.run(database.delete_event(event_id, guild_id=1)) is True
+    assert asyncio.run(database.get_event_index(1)) == []
+
+def test_series_operations_touch_every_occurrence(temp_db):
+    now = datetime.datetime.utcnow().replace(microsecond=0)
+    times = [now + datetime.timedelta(minutes=3), now + datetime.timedelta(days=1)]
+    series_id = asyncio.run(database.add_series(1, "Bear / 熊", times, "", "Bear / 熊", None, "1d", "", 0, 30))
+
+    # First occurrence's reminder goes out, then the series is pushed back an hour
+    due = asyncio.run(database.get_upcoming_reminders(now))
+    asyncio.run(database.mark_reminder_sent(due[0].reminder_id))
+    assert asyncio.run(database.shift_series(1, series_id, 60, now=now)) == 2
+    assert asyncio.run(database.set_series_duration(1, series_id, 45)) == 2
+
+    events = asyncio.run(database.get_all_events(1))
+    assert [database.parse_event_time(e['event_time']) for e in events] == [t + datetime.timedelta(hours=1) for t in times]
+    assert {e['duration'] for e in events} == {45}
+    # The sent reminder now lies in the future again, so it is re-armed
+    due = asyncio.run(database.get_upcoming_reminders(now + datetime.timedelta(hours=1)))
+    assert [r.event_id for r in due] == [events[0]['id']]
+
+    assert asyncio.run(database.delete_series(2, series_id)) == 0
+    assert asyncio.run(database.delete_series(1, series_id)) == 2
+    assert asyncio.run(database.get_upcoming_reminders(now + datetime.timedelta(days=2))) == []
+
+@pytest.mark.parametrize("backend", ["sqlite", "memory"])
+def test_shifted_series_reminder_is_queued_again(temp_db, backend):
+    if backend == "memory":
+        database.use_backend("memory")
+        asyncio.run(database.init_db())
+    now = datetime.datetime.utcnow().replace(microsecond=0)
+    series_id = asyncio.run(database.add_series(1, "Shield / 護盾", [now + datetime.timedelta(minutes=20)], "", "Shield / 護盾", None, "1d", "", 0, 0))
+
+    # The 15m alert goes out through the outbox
+    assert asyncio.run(database.enqueue_due_reminders(now + datetime.timedelta(minutes=5))) == 1
+    batch = asyncio.run(database.fetch_outbox_batch(now=now + datetime.timedelta(minutes=5)))
+    asyncio.run(database.ack_outbox([r.outbox_id for r in batch]))
+
+    # Pushed back an hour, it has to be delivered again at its new time
+    asyncio.run(database.shift_series(1, series_id, 60, now=now + datetime.timedelta(minutes=6)))
+    later = now + datetime.timedelta(minutes=65)
+    assert asyncio.run(database.enqueue_due_reminders(later)) == 1
+    batch = asyncio.run(database.fetch_outbox_batch(now=later))
+    assert [r.offset_minutes for r in batch] == [15]
+
+def test_outbox_enqueue_and_ack(temp_db):
+    now = datetime.datetime.utcnow()
+    add("Bear / 熊", 3, now)
+
+    assert asyncio.run(database.enqueue_due_reminders(now)) == 1
+    # Already queued: the reminder is no longer due
+    assert asyncio.run(database.enqueue_due_reminders(now)) == 0
+
+    batch = asyncio.run(database.fetch_outbox_batch(now=now))
+    assert len(batch) == 1 and batch[0].offset_minutes == 5
+
+    asyncio.run(database.retry_outbox(batch[0].outbox_id, "boom", 30))
+    assert asyncio.run(database.fetch_outbox_batch(now=now)) == []
+    later = now + datetime.timedelta(seconds=31)
+    batch = asyncio.run(database.fetch_outbox_batch(now=later))
+    assert batch[0].attempts == 1
+
+    asyncio.run(database.ack_outbox([batch[0].outbox_id]))
+    assert asyncio.run(database.fetch_outbox_batch(now=later)) == []
+
+class FakeChannel:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, content=None, embed=None, embeds=None):
+        self.sent.append((content, embeds or [embed]))
+
+class FakeBot:
+    def __init__(self, channel):
+        self.channel = channel
+
+    def get_channel(self, channel_id):
+        return self.channel
+
+def test_simultaneous_reminders_share_one_message(temp_db):
+    from cogs.scheduler import Scheduler, chunk_digest
+
+    now = datetime.datetime.utcnow()
+    asyncio.run(database.set_guild_channel(1, 100))
+    for name in ("Bear / 熊", "Swordland / 聖劍", "Viking / 維京"):
+        add(name, 3, now)
+
+    channel = FakeChannel()
+    cog = Scheduler(FakeBot(channel), clock=lambda: now, autostart=False)
+    try:
+        assert asyncio.run(database.enqueue_due_reminders(now)) == 3
+        assert asyncio.run(cog.drain_outbox()) == 3
+    finally:
+        cog.cog_unload()
+    assert len(channel.sent) == 1
+    content, embeds = channel.sent[0]
+    assert content == "@everyone" and len(embeds) == 3
+    assert asyncio.run(database.fetch_outbox_batch(now=now)) == []
+
+    # Beyond 10 embeds a second message is needed
+    embed = embeds[0]
+    assert [len(chunk) for chunk in chunk_digest([(None, embed)] * 12)] == [10, 2]
+
+def test_stale_outbox_entries_are_summarized_not_pinged(temp_db):
+    from cogs.scheduler import Scheduler
+
+    now = datetime.datetime.utcnow()
+    asyncio.run(database.set_guild_channel(1, 100))
+    add("Bear / 熊", 3, now)
+    # Queued, then the bot died before draining
+    assert asyncio.run(database.enqueue_due_reminders(now)) == 1
+
+    channel = FakeChannel()
+    later = now + datetime.timedelta(hours=3)
+    cog = Scheduler(FakeBot(channel), clock=lambda: later, autostart=False)
+    try:
+        assert asyncio.run(cog.drain_outbox()) == 0
+    finally:
+        cog.cog_unload()
+    assert len(channel.sent) == 1
+    content, embeds = channel.sent[0]
+    assert content is None and "Missed" in embeds[0].title
+    assert asyncio.run(database.fetch_outbox_batch(now=later)) == []
+
+def test_tick_planning_and_overlap(temp_db):
+    from cogs.scheduler import Scheduler, plan_interval, TICK_MIN_SECONDS, TICK_MAX_SECONDS, TICK_SLACK_SECONDS
+
+    now = datetime.datetime(2030, 1, 1, 12, 0)
+    assert plan_interval(now, None, 2.0) == (2.0 + TICK_MAX_SECONDS, "idle")
+    assert plan_interval(now, now - datetime.timedelta(minutes=1), 0.0) == (TICK_MIN_SECONDS, "backlog")
+    assert plan_interval(now, now + datetime.timedelta(seconds=90), 1.0) == (1.0 + 90 + TICK_SLACK_SECONDS, "due")
+
+    cog = Scheduler(FakeBot(FakeChannel()), clock=lambda: now, autostart=False)
+
+    async def overlapping():
+        await asyncio.gather(cog.run_tick(), cog.run_tick())
+
+    try:
+        asyncio.run(overlapping())
+    finally:
+        cog.cog_unload()
+    assert cog.metrics["ticks"] == 1 and cog.metrics["overlaps_skipped"] == 1
+    assert cog.metrics["interval_reason"] == "idle"
+
+class StartingBot(FakeBot):
+    async def wait_until_ready(self):
+        pass
+
+def test_startup_migrates_before_catching_up(blank_db):
+    from cogs.scheduler import Scheduler
+
+    # A database as the pre-reminders-table release left it, with a reminder due while the bot was down
+    now = datetime.datetime.utcnow().replace(microsecond=0)
+    with sqlite3.connect(blank_db) as db:
+        db.executescript("""
+            CREATE TABLE events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, guild_id INTEGER, name TEXT, event_time TIMESTAMP, description TEXT,
+                reminder_30_sent INTEGER DEFAULT 0, reminder_5_sent INTEGER DEFAULT 0, event_type TEXT, coordinates TEXT,
+                repeat_config TEXT, icon_url TEXT, color_hex INTEGER, duration INTEGER DEFAULT 0
+            );
+            CREATE TABLE guild_settings (guild_id INTEGER PRIMARY KEY, announcement_channel_id INTEGER);
+            INSERT INTO guild_settings VALUES (1, 100);
+        """)
+        db.execute("INSERT INTO events (guild_id, name, event_time, description, event_type) VALUES (1, 'Bear / 熊', ?, '', 'Bear / 熊')",
+                   (str(now + datetime.timedelta(minutes=3)),))
+
+    channel = FakeChannel()
+    cog = Scheduler(StartingBot(channel), clock=lambda: now, autostart=False)
+    try:
+        asyncio.run(cog.before_check_reminders())
+    finally:
+        cog.cog_unload()
+    assert len(channel.sent) == 1
+    content, embeds = channel.sent[0]
+    assert content == "@everyone" and len(embeds) == 1
@@ -0,0 +1,35 @@
+import asyncio
+import os
+import sys
+
+# Add parent directory to path to import database
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+ROWS = [
+    {"name": "Bear / 熊", "event_time": "2030-01-01 12:00", "description": "North gate, bring healers / 北門集合, 帶治療兵"},
+    {"name": "Viking / 維京", "event_time": "2030-01-01 10:00", "description": "Bring healers"},
+    {"name": "Shield / 護盾", "event_time": "2030-01-02 12:00", "description": ""},
+]
+
+def names(results):
+    return [r['name'] for r in results]
+
+def test_search_ranks_and_filters_by_guild(temp_db):
+    asyncio.run(database.import_events(1, ROWS))
+    asyncio.run(database.import_events(2, ROWS))
+
+    # Same relevance: earlier event first
+    assert names(asyncio.run(database.search_events(1, "healers"))) == ["Viking / 維京", "Bear / 熊"]
+    # Every term must match; short CJK terms go through LIKE
+    assert names(asyncio.run(database.search_events(1, "healers 熊"))) == ["Bear / 熊"]
+    assert names(asyncio.run(database.search_events(1, "治療"))) == ["Bear / 熊"]
+    assert names(asyncio.run(database.search_events(1, "shield"))) == ["Shield / 護盾"]
+    assert asyncio.run(database.search_events(1, '"dragon')) == []
+
+    # Triggers keep the index in step with deletes
+    bear = asyncio.run(database.search_events(1, "north"))[0]
+    asyncio.run(database.delete_event(bear['id']))
+    assert asyncio.run(database.search_events(1, "north")) == []
+    assert len(asyncio.run(database.search_events(2, "north"))) == 1
@@ -0,0 +1,119 @@
+import asyncio
+import datetime
+import os
+import sys
+
+# Add parent directory to path to import database
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+NOW = datetime.datetime(2030, 1, 7, 12, 0)
+
+def minutes(n):
+    return NOW + datetime.timedelta(minutes=n)
+
+async def scenario():
+    """Runs the scheduler's storage calls and returns everything observable, minus random series ids."""
+    await database.init_db()
+    seen = []
+
+    await database.set_guild_channel(1, 100)
+    await database.set_guild_channel(2, 200)
+    seen.append(await database.get_all_guild_channels())
+
+    await database.add_event(1, "Shield / 護盾", minutes(30), "up", "Shield / 護盾", None, None, "", 0, 0)
+    await database.add_event(1, "Bear / 熊", minutes(3), "north", "Bear / 熊", None, "1d", "", 0, 30)
+    await database.add_event(2, "Viking / 維京", minutes(-30), "", "Viking / 維京", None, None, "", 0, 30)
+    series_id = await database.add_series(2, "Bear / 熊", [minutes(60 * i) for i in range(1, 4)], "", "Bear / 熊", None, "1h", "", 0, 30)
+
+    for at in (NOW, minutes(16), minutes(26)):
+        seen.append(await database.get_upcoming_reminders(at))
+        seen.append(await database.get_missed_reminders(at))
+
+    seen.append(await database.enqueue_due_reminders(minutes(16)))
+    batch = await database.fetch_outbox_batch(now=minutes(16))
+    seen.append(batch)
+    await database.retry_outbox(batch[0].outbox_id, "boom", 60, now=minutes(16))
+    await database.ack_outbox([r.outbox_id for r in batch[1:]], minutes(16))
+    seen.append(await database.fetch_outbox_batch(now=minutes(16)))
+    seen.append(await database.fetch_outbox_batch(now=minutes(17)))
+
+    await database.mark_reminder_sent(seen[1][0].reminder_id)
+    seen.append(await database.shift_series(2, series_id, -30, now=NOW))
+    seen.append(await database.set_series_duration(2, series_id, 65))
+    seen.append(await database.delete_event(2, guild_id=2))
+    seen.append(await database.get_event_index(2))
+    seen.append(await database.get_event_conflicts(2, [3], series_id=series_id))
+    seen.append(await database.get_event_conflicts(1, [1, 2]))
+
+    seen.append(await database.archive_old_events(minutes(60)))
+    events = [dict(e) for e in await database.get_all_events()]
+    for e in events:
+        e.pop("series_id")
+    seen.append(events)
+    seen.append(await database.get_upcoming_reminders(minutes(200)))
+    seen.append(await database.get_event_descriptions([1, 2, 4]))
+    history = [dict(e) for e in await database.get_event_history(2, minutes(-60), minutes(60))]
+    for e in history:
+        e.pop("series_id")
+    seen.append(history)
+    return seen
+
+def test_memory_backend_matches_sqlite(blank_db):
+    expected = asyncio.run(scenario())
+    database.use_backend("memory")
+    actual = asyncio.run(scenario())
+
+    for step, (want, got) in enumerate(zip(expected, actual)):
+        assert got == want, f"step {step}"
+
+def test_archive_moves_in_batches_and_partitions_by_month(temp_db):
+    async def scenario():
+        # Ten past events straddling a month boundary, plus one upcoming
+        start = datetime.datetime(2029, 12, 31, 20, 0)
+        for i in range(10):
+            await database.add_event(1, "Bear / 熊", start + datetime.timedelta(hours=i), "", "Bear / 熊", None, None, "", 0, 30)
+        await database.add_event(1, "Bear / 熊", minutes(60), "", "Bear / 熊", None, None, "", 0, 30)
+
+        moved = await database.archive_old_events(NOW, batch_size=3)
+        live = await database.get_all_events(1)
+        december = await database.get_event_history(1, datetime.datetime(2029, 12, 1), datetime.datetime(2030, 1, 1))
+        january = await database.get_event_history(1, datetime.datetime(2030, 1, 1), datetime.datetime(2030, 2, 1))
+        return moved, live, december, january
+
+    moved, live, december, january = asyncio.run(scenario())
+
+    assert moved == 10
+    assert [e["event_time"] for e in live] == [str(minutes(60))]
+    assert [(e["month"], e["event_time"]) for e in december] == [("2029-12", "2029-12-31 20:00:00"), ("2029-12", "2029-12-31 21:00:00"),
+                                                                 ("2029-12", "2029-12-31 22:00:00"), ("2029-12", "2029-12-31 23:00:00")]
+    assert len(january) == 6 and {e["month"] for e in january} == {"2030-01"}
+
+def test_conflicts_follow_writes(blank_db):
+    async def scenario():
+        await database.init_db()
+        a = await database.add_event(1, "Bear / 熊", minutes(0), "", "Bear / 熊", None, None, "", 0, 60)
+        b = await database.add_event(1, "Shield / 護盾", minutes(30), "", "Shield / 護盾", None, None, "", 0, 60)
+        await database.add_event(2, "Bear / 熊", minutes(30), "", "Bear / 熊", None, None, "", 0, 60) # other guild
+        series_id = await database.add_series(1, "Viking / 維京", [minutes(120), minutes(180)], "", "Viking / 維京", None, "1h", "", 0, 30)
+        seen = [await database.get_event_conflicts(1, [a, b], series_id=series_id)]
+
+        await database.shift_series(1, series_id, -90, now=NOW) # first occurrence lands on the Bear and the Shield
+        seen.append(await database.get_event_conflicts(1, [a, b], series_id=series_id))
+        await database.set_series_duration(1, series_id, 0)
+        seen.append(await database.get_event_conflicts(1, [a, b], series_id=series_id))
+        await database.delete_event(b, 1)
+        seen.append(await database.get_event_conflicts(1, [a, b], series_id=series_id))
+        return a, b, seen
+
+    for name in ("sqlite", "memory"):
+        database.use_backend(name)
+        a, b, seen = asyncio.run(scenario())
+        first = a + 3 # first occurrence of the series
+        ids = lambda conflicts: {event_id: [other for other, _, _ in others] for event_id, others in conflicts.items()}
+        assert seen[0] == {a: [(b, "Shield / 護盾", str(minutes(30)))], b: [(a, "Bear / 熊", str(minutes(0)))]}, name
+        assert ids(seen[1]) == {a: [b, first], b: [a, first], first: [a, b]}, name
+        # Zero-length at minutes(30): still inside the Bear, but only touches the Shield's start
+        assert ids(seen[2]) == {a: [b, first], b: [a], first: [a]}, name
+        assert ids(seen[3]) == {a: [first], first: [a]}, name